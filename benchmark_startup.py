@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark the import time and the cold start time of the MCP server.
+
+The cold start time is measured the way an MCP client sees it: from spawning the
+server over stdio until the `initialize` handshake and `tools/list` are answered.
+The server is configured with the current environment variables, so run it with
+e.g. EMBEDDING_LOAD_MODE=background to compare the model loading strategies.
+The load mode does not change the import time: qdrant-client imports fastembed,
+and with it onnxruntime, along with the server module.
+
+Usage:
+    python benchmark_startup.py [--runs 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from mcp import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); "
+    "import mcp_server_qdrant.mcp_server; "
+    "print(time.perf_counter() - start)"
+)
+
+SERVER_SNIPPET = "from mcp_server_qdrant.main import main; main()"
+
+
+def measure_import() -> float:
+    """Import the server module in a fresh interpreter and return the import time."""
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", IMPORT_SNIPPET],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+async def measure_startup() -> tuple[float, float]:
+    """
+    Spawn the server over stdio.
+    :return: The time until `initialize` and until `tools/list` were answered.
+    """
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-W", "ignore", "-c", SERVER_SNIPPET],
+        env=dict(os.environ),
+    )
+    start = time.perf_counter()
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            initialized = time.perf_counter() - start
+            await session.list_tools()
+            listed = time.perf_counter() - start
+    return initialized, listed
+
+
+def report(name: str, samples: list[float]) -> None:
+    print(
+        f"{name:<24} median {statistics.median(samples) * 1000:8.1f} ms   "
+        f"min {min(samples) * 1000:8.1f} ms   max {max(samples) * 1000:8.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"EMBEDDING_LOAD_MODE={os.getenv('EMBEDDING_LOAD_MODE', 'eager')}")
+    report("import", [measure_import() for _ in range(args.runs)])
+
+    initialize, list_tools = [], []
+    for _ in range(args.runs):
+        initialized, listed = await measure_startup()
+        initialize.append(initialized)
+        list_tools.append(listed)
+    report("initialize", initialize)
+    report("initialize + list_tools", list_tools)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
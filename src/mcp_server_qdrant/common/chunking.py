@@ -0,0 +1,31 @@
+# The metadata keys describing the chunk of an entry
+PARENT_ID_KEY = "parent_id"
+CHUNK_INDEX_KEY = "chunk_index"
+CHUNK_COUNT_KEY = "chunk_count"
+
+
+def make_chunks(
+    spans: list[tuple[int, int]], max_tokens: int, overlap: int = 0
+) -> list[tuple[int, int]]:
+    """
+    Group the tokens of a text into windows of at most `max_tokens` tokens.
+    Consecutive windows share `overlap` tokens, so a sentence cut by a window boundary
+    is still complete in one of them.
+    :param spans: The (start, end) character offsets of the tokens, in order.
+    :param max_tokens: The maximum number of tokens of a window.
+    :param overlap: The number of tokens shared by consecutive windows.
+    :return: The (start, end) character offsets of the windows.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be a positive number")
+    if not 0 <= overlap < max_tokens:
+        raise ValueError("overlap must be between 0 and max_tokens - 1")
+
+    chunks = []
+    step = max_tokens - overlap
+    for start in range(0, len(spans), step):
+        window = spans[start : start + max_tokens]
+        chunks.append((window[0][0], window[-1][1]))
+        if start + max_tokens >= len(spans):
+            break
+    return chunks
@@ -0,0 +1,117 @@
+from qdrant_client import models
+
+from mcp_server_qdrant.settings import QdrantSettings
+
+
+def make_quantization_config(
+    settings: QdrantSettings,
+) -> models.QuantizationConfig | None:
+    """
+    Build the quantization config of the collections created by the server.
+    :param settings: The Qdrant settings.
+    :return: The quantization config, or None if quantization is disabled.
+    """
+    always_ram = settings.quantization_always_ram
+    if settings.quantization == "none":
+        return None
+    if settings.quantization == "scalar":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=settings.scalar_quantile,
+                always_ram=always_ram,
+            )
+        )
+    if settings.quantization == "product":
+        return models.ProductQuantization(
+            product=models.ProductQuantizationConfig(
+                compression=models.CompressionRatio(
+                    settings.product_quantization_ratio
+                ),
+                always_ram=always_ram,
+            )
+        )
+    if settings.quantization == "binary":
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=always_ram)
+        )
+    raise ValueError(f"Unsupported quantization: {settings.quantization}")
+
+
+def make_search_params(
+    settings: QdrantSettings,
+    hnsw_ef: int | None = None,
+    exact: bool | None = None,
+) -> models.SearchParams | None:
+    """
+    Build the search params of the queries.
+    :param settings: The Qdrant settings.
+    :param hnsw_ef: Overrides the size of the HNSW search beam of the settings, optional.
+    :param exact: Overrides the exact search mode of the settings, optional.
+    :return: The search params, or None to use the defaults of the Qdrant server.
+    """
+    if hnsw_ef is None:
+        hnsw_ef = settings.search_hnsw_ef
+    if exact is None:
+        exact = settings.search_exact
+
+    quantization = None
+    if (
+        settings.quantization != "none"
+        or not settings.search_rescore
+        or settings.search_oversampling is not None
+    ):
+        # The quantized vectors select the candidates, which are rescored with the original vectors
+        quantization = models.QuantizationSearchParams(
+            rescore=settings.search_rescore,
+            oversampling=settings.search_oversampling,
+        )
+
+    if hnsw_ef is None and not exact and quantization is None:
+        return None
+    return models.SearchParams(hnsw_ef=hnsw_ef, exact=exact, quantization=quantization)
+
+
+def make_hnsw_config(settings: QdrantSettings) -> models.HnswConfigDiff | None:
+    """
+    Build the HNSW config of the collections created by the server.
+    :param settings: The Qdrant settings, with the collection profile applied.
+    :return: The HNSW config, or None to use the defaults of the Qdrant server.
+    """
+    if (
+        settings.hnsw_m is None
+        and settings.hnsw_ef_construct is None
+        and settings.hnsw_on_disk is None
+    ):
+        return None
+    return models.HnswConfigDiff(
+        m=settings.hnsw_m,
+        ef_construct=settings.hnsw_ef_construct,
+        on_disk=settings.hnsw_on_disk,
+    )
+
+
+def make_optimizers_config(
+    settings: QdrantSettings,
+) -> models.OptimizersConfigDiff | None:
+    """
+    Build the optimizers config of the collections created by the server.
+    :param settings: The Qdrant settings, with the collection profile applied.
+    :return: The optimizers config, or None to use the defaults of the Qdrant server.
+    """
+    if settings.indexing_threshold is None and settings.default_segment_number is None:
+        return None
+    return models.OptimizersConfigDiff(
+        indexing_threshold=settings.indexing_threshold,
+        default_segment_number=settings.default_segment_number,
+    )
+
+
+def make_vector_datatype(settings: QdrantSettings) -> models.Datatype | None:
+    """
+    Get the datatype of the vectors of the collections created by the server.
+    :param settings: The Qdrant settings, with the collection profile applied.
+    """
+    if settings.vector_datatype is None:
+        return None
+    return models.Datatype(settings.vector_datatype)
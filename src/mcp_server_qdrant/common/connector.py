@@ -0,0 +1,56 @@
+from mcp_server_qdrant.common.collection_config import (
+    make_hnsw_config,
+    make_optimizers_config,
+    make_quantization_config,
+    make_search_params,
+    make_vector_datatype,
+)
+from mcp_server_qdrant.common.filters import make_indexes
+from mcp_server_qdrant.embeddings.base import EmbeddingProvider
+from mcp_server_qdrant.embeddings.sparse import SparseEmbeddingProvider
+from mcp_server_qdrant.qdrant import QdrantConnector
+from mcp_server_qdrant.settings import QdrantSettings
+
+
+def create_qdrant_connector(
+    qdrant_settings: QdrantSettings,
+    embedding_provider: EmbeddingProvider | None,
+    sparse_embedding_provider: SparseEmbeddingProvider | None = None,
+) -> QdrantConnector:
+    """
+    Create a Qdrant connector configured by the settings, so the server and the ingest command
+    read and write the collections the same way.
+    :param qdrant_settings: The settings of the Qdrant connector.
+    :param embedding_provider: The embedding provider to use, None in sparse-only mode.
+    :param sparse_embedding_provider: The sparse embedding provider of hybrid search, optional.
+    """
+    return QdrantConnector(
+        qdrant_settings.location,
+        qdrant_settings.api_key,
+        qdrant_settings.collection_name,
+        embedding_provider,
+        qdrant_settings.local_path,
+        make_indexes(qdrant_settings.filterable_fields_dict()),
+        quantization_config=make_quantization_config(qdrant_settings),
+        vectors_on_disk=qdrant_settings.vectors_on_disk,
+        search_params=make_search_params(qdrant_settings),
+        score_threshold=qdrant_settings.score_threshold,
+        hnsw_config=make_hnsw_config(qdrant_settings),
+        optimizers_config=make_optimizers_config(qdrant_settings),
+        on_disk_payload=qdrant_settings.on_disk_payload,
+        vector_datatype=make_vector_datatype(qdrant_settings),
+        collection_cache_ttl=qdrant_settings.collection_cache_ttl,
+        store_batch_size=qdrant_settings.store_batch_size,
+        chunk_max_tokens=qdrant_settings.chunk_max_tokens,
+        chunk_overlap=qdrant_settings.chunk_overlap,
+        deterministic_ids=qdrant_settings.deterministic_ids,
+        search_cache_size=qdrant_settings.search_cache_size,
+        search_cache_max_bytes=qdrant_settings.search_cache_max_bytes,
+        search_cache_ttl=qdrant_settings.search_cache_ttl,
+        semantic_cache_size=qdrant_settings.semantic_cache_size,
+        semantic_cache_threshold=qdrant_settings.semantic_cache_threshold,
+        single_flight=qdrant_settings.search_single_flight,
+        sparse_embedding_provider=sparse_embedding_provider,
+        hybrid_fusion=qdrant_settings.hybrid_fusion,
+        hybrid_prefetch_limit=qdrant_settings.hybrid_prefetch_limit,
+    )
@@ -0,0 +1,140 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters describing the state and the effectiveness of a cache.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A bounded in-memory cache with least-recently-used eviction and an optional time-to-live.
+    Not thread-safe: it is meant to be used from a single event loop.
+    :param max_entries: The maximum number of entries to keep.
+    :param max_bytes: The maximum total size of the values, as measured by `sizeof`. None means unbounded.
+    :param ttl: The number of seconds an entry stays valid. None means entries never expire.
+    :param sizeof: A function returning the approximate size of a value in bytes.
+    :param clock: A monotonic clock, injectable for testing.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        sizeof: Callable[[V], int] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive number")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._sizeof = sizeof or (lambda _: 0)
+        self._clock = clock
+        # key -> (expires_at, size, value)
+        self._data: OrderedDict[K, tuple[float | None, int, V]] = OrderedDict()
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self._lookup(key) is not None
+
+    def get(self, key: K) -> V | None:
+        """
+        Get a value from the cache, marking it as recently used.
+        :param key: The key to look up.
+        :return: The cached value, or None if it is missing or expired.
+        """
+        item = self._lookup(key)
+        if item is None:
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        self._data.move_to_end(key)
+        return item[2]
+
+    def put(self, key: K, value: V) -> None:
+        """
+        Put a value into the cache, evicting the least recently used entries if the limits are exceeded.
+        :param key: The key to store the value under.
+        :param value: The value to store.
+        """
+        size = self._sizeof(value)
+        if self._max_bytes is not None and size > self._max_bytes:
+            # The value would evict everything else and still not fit.
+            return
+        self._remove(key)
+        expires_at = self._clock() + self._ttl if self._ttl is not None else None
+        self._data[key] = (expires_at, size, value)
+        self._stats.size_bytes += size
+        while len(self._data) > self._max_entries or (
+            self._max_bytes is not None and self._stats.size_bytes > self._max_bytes
+        ):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self._stats.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """
+        Remove a single entry from the cache, if present.
+        """
+        self._remove(key)
+
+    def clear(self) -> None:
+        """
+        Remove all the entries from the cache. The hit and miss counters are kept.
+        """
+        self._data.clear()
+        self._stats.size_bytes = 0
+
+    def stats(self) -> CacheStats:
+        """
+        Get a snapshot of the cache counters.
+        """
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            expirations=self._stats.expirations,
+            entries=len(self._data),
+            size_bytes=self._stats.size_bytes,
+        )
+
+    def _lookup(self, key: K) -> tuple[float | None, int, V] | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at = item[0]
+        if expires_at is not None and expires_at <= self._clock():
+            self._remove(key)
+            self._stats.expirations += 1
+            return None
+        return item
+
+    def _remove(self, key: K) -> None:
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._stats.size_bytes -= item[1]
@@ -0,0 +1,143 @@
+import time
+from typing import Callable, Generic, Hashable, TypeVar
+
+import numpy as np
+
+from mcp_server_qdrant.common.lru import CacheStats
+
+C = TypeVar("C", bound=Hashable)
+V = TypeVar("V")
+
+
+class SemanticCache(Generic[C, V]):
+    """
+    A bounded in-memory cache looked up by vector similarity, so rephrased queries share an entry.
+    The vectors of the cached queries are the rows of a matrix, compared with a query in a single
+    dot product. An entry is only returned for the same context, e.g. the collection and the filter.
+    Not thread-safe: it is meant to be used from a single event loop.
+    :param max_entries: The maximum number of entries to keep, evicted in LRU order.
+    :param threshold: The minimal cosine similarity between a query and a cached one.
+    :param ttl: The number of seconds an entry stays valid. None means entries never expire.
+    :param clock: A monotonic clock, injectable for testing.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        threshold: float,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive number")
+        if not -1.0 <= threshold <= 1.0:
+            raise ValueError("threshold must be between -1 and 1")
+        self._max_entries = max_entries
+        self._threshold = threshold
+        self._ttl = ttl
+        self._clock = clock
+        # Allocated on the first put, once the size of the vectors is known
+        self._vectors: np.ndarray | None = None
+        self._contexts: list[C | None] = [None] * max_entries
+        self._values: list[V | None] = [None] * max_entries
+        self._expires_at = np.full(max_entries, np.inf)
+        # The tick of the last use of each row, the lowest one is evicted first
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._tick = 0
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        return sum(context is not None for context in self._contexts)
+
+    def get(self, context: C, vector: np.ndarray) -> V | None:
+        """
+        Get the value of the most similar cached vector of the same context.
+        :param context: The context the cached entry must match exactly.
+        :param vector: The vector of the query.
+        :return: The cached value, or None if no entry is similar enough.
+        """
+        row = self._find(context, vector)
+        if row is None:
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        self._tick += 1
+        self._last_used[row] = self._tick
+        return self._values[row]
+
+    def put(self, context: C, vector: np.ndarray, value: V) -> None:
+        """
+        Put a value into the cache, evicting the least recently used entry if the cache is full.
+        :param context: The context of the entry.
+        :param vector: The vector of the query.
+        :param value: The value to store.
+        """
+        unit = self._normalize(vector)
+        if self._vectors is None:
+            self._vectors = np.zeros((self._max_entries, unit.shape[0]), np.float32)
+        free = [row for row, c in enumerate(self._contexts) if c is None]
+        if free:
+            row = free[0]
+        else:
+            row = int(np.argmin(self._last_used))
+            self._stats.evictions += 1
+        self._tick += 1
+        self._vectors[row] = unit
+        self._contexts[row] = context
+        self._values[row] = value
+        self._last_used[row] = self._tick
+        self._expires_at[row] = (
+            self._clock() + self._ttl if self._ttl is not None else np.inf
+        )
+
+    def invalidate(self, predicate: Callable[[C], bool]) -> None:
+        """
+        Remove the entries whose context matches the predicate.
+        """
+        for row, context in enumerate(self._contexts):
+            if context is not None and predicate(context):
+                self._remove(row)
+
+    def stats(self) -> CacheStats:
+        """
+        Get a snapshot of the cache counters. The size is the one of the vector matrix.
+        """
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            expirations=self._stats.expirations,
+            entries=len(self),
+            size_bytes=self._vectors.nbytes if self._vectors is not None else 0,
+        )
+
+    def _find(self, context: C, vector: np.ndarray) -> int | None:
+        if self._vectors is None:
+            return None
+        similarities = self._vectors @ self._normalize(vector)
+        candidates = np.flatnonzero(similarities >= self._threshold)
+        now = self._clock()
+        # The most similar entries are tried first
+        for row in candidates[np.argsort(-similarities[candidates])]:
+            if self._contexts[row] != context:
+                continue
+            if self._expires_at[row] <= now:
+                self._remove(row)
+                self._stats.expirations += 1
+                continue
+            return int(row)
+        return None
+
+    def _remove(self, row: int) -> None:
+        assert self._vectors is not None
+        # A zero vector never reaches a positive threshold
+        self._vectors[row] = 0.0
+        self._contexts[row] = None
+        self._values[row] = None
+        self._last_used[row] = 0
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
@@ -39,7 +39,7 @@ def wrap_filters(
             continue
         param_names.append(param_name)
 
-    new_params = [sig.parameters[param_name] for param_name in param_names]
+    params = [sig.parameters[param_name] for param_name in param_names]
     required_new_params = []
     optional_new_params = []
 
@@ -85,7 +85,12 @@ def wrap_filters(
             )
             optional_new_params.append(parameter)
 
+    # The parameters with a default value have to follow the required ones
+    new_params = [param for param in params if param.default is inspect.Parameter.empty]
     new_params.extend(required_new_params)
+    new_params.extend(
+        param for param in params if param.default is not inspect.Parameter.empty
+    )
     new_params.extend(optional_new_params)
 
     # Set the new __signature__ for introspection
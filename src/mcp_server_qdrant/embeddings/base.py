@@ -1,8 +1,20 @@
+import asyncio
+import re
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+# Words and punctuation, approximating the tokens of a model
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
 
 class EmbeddingProvider(ABC):
-    """Abstract base class for embedding providers."""
+    """
+    Abstract base class for embedding providers.
+    The `*_array` methods return float32 NumPy arrays and are the ones used by the Qdrant connector.
+    Their default implementations convert the results of the list-based methods, so providers
+    producing arrays natively should override them and implement the list-based methods on top.
+    """
 
     @abstractmethod
     async def embed_documents(self, documents: list[str]) -> list[list[float]]:
@@ -14,6 +26,35 @@ class EmbeddingProvider(ABC):
         """Embed a query into a vector."""
         pass
 
+    async def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """
+        Embed several queries at once. Providers able to embed a batch of queries
+        in a single call should override this method.
+        """
+        return list(await asyncio.gather(*(self.embed_query(q) for q in queries)))
+
+    async def embed_documents_array(self, documents: list[str]) -> np.ndarray:
+        """Embed a list of documents into a float32 array of shape (len(documents), dim)."""
+        embeddings = await self.embed_documents(documents)
+        return _as_matrix(embeddings, self.get_vector_size())
+
+    async def embed_query_array(self, query: str) -> np.ndarray:
+        """Embed a query into a float32 array of shape (dim,)."""
+        return np.asarray(await self.embed_query(query), dtype=np.float32)
+
+    async def embed_queries_array(self, queries: list[str]) -> np.ndarray:
+        """Embed several queries into a float32 array of shape (len(queries), dim)."""
+        embeddings = await self.embed_queries(queries)
+        return _as_matrix(embeddings, self.get_vector_size())
+
+    async def token_spans(self, text: str) -> list[tuple[int, int]]:
+        """
+        Split the text into the tokens of the model, as (start, end) character offsets, with no truncation.
+        The default implementation approximates the tokens with the words and punctuation of the text,
+        providers with access to the tokenizer of the model should override it.
+        """
+        return approximate_token_spans(text)
+
     @abstractmethod
     def get_vector_name(self) -> str:
         """Get the name of the vector for the Qdrant collection."""
@@ -23,3 +64,16 @@ class EmbeddingProvider(ABC):
     def get_vector_size(self) -> int:
         """Get the size of the vector for the Qdrant collection."""
         pass
+
+
+def approximate_token_spans(text: str) -> list[tuple[int, int]]:
+    """
+    Split the text into its words and punctuation, as (start, end) character offsets.
+    """
+    return [match.span() for match in _TOKEN_PATTERN.finditer(text)]
+
+
+def _as_matrix(embeddings: list[list[float]], size: int) -> np.ndarray:
+    if not embeddings:
+        return np.empty((0, size), dtype=np.float32)
+    return np.asarray(embeddings, dtype=np.float32)
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+
+import numpy as np
+
+from mcp_server_qdrant.embeddings.base import EmbeddingProvider
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingEmbeddingProvider(EmbeddingProvider):
+    """
+    Wraps another embedding provider and coalesces concurrent `embed_query` calls.
+    Queries arriving within the batching window are embedded together with a single
+    `embed_queries` call of the wrapped provider, and every caller receives its own vector.
+    A batch is sent as soon as it reaches the maximum size, without waiting for the window to end.
+    :param provider: The embedding provider to wrap.
+    :param window_ms: How long to wait for more queries after the first one, in milliseconds.
+    :param max_batch_size: The maximum number of distinct queries embedded in a single call.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        window_ms: float,
+        max_batch_size: int,
+    ):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be a positive number")
+        self.provider = provider
+        self.model_name = getattr(provider, "model_name", type(provider).__name__)
+        self._window = window_ms / 1000
+        self._max_batch_size = max_batch_size
+        self._pending: dict[str, list[asyncio.Future[np.ndarray]]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        # Keep references to the running batches, so they are not garbage collected
+        self._tasks: set[asyncio.Task] = set()
+
+    async def embed_documents(self, documents: list[str]) -> list[list[float]]:
+        """Embed a list of documents into vectors."""
+        return await self.provider.embed_documents(documents)
+
+    async def embed_documents_array(self, documents: list[str]) -> np.ndarray:
+        """Embed a list of documents into a float32 array."""
+        return await self.provider.embed_documents_array(documents)
+
+    async def embed_query(self, query: str) -> list[float]:
+        """Embed a query into a vector, together with the other queries of the current window."""
+        return (await self.embed_query_array(query)).tolist()
+
+    async def embed_query_array(self, query: str) -> np.ndarray:
+        """Embed a query into a float32 array, together with the other queries of the current window."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[np.ndarray] = loop.create_future()
+        # Identical queries in the same window share a single slot of the batch
+        self._pending.setdefault(query, []).append(future)
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._window, self._flush)
+
+        return await future
+
+    async def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """Embed several queries at once, bypassing the batching window."""
+        return await self.provider.embed_queries(queries)
+
+    async def embed_queries_array(self, queries: list[str]) -> np.ndarray:
+        """Embed several queries into a float32 array, bypassing the batching window."""
+        return await self.provider.embed_queries_array(queries)
+
+    async def token_spans(self, text: str) -> list[tuple[int, int]]:
+        """Split the text into the tokens of the wrapped provider's model."""
+        return await self.provider.token_spans(text)
+
+    def get_vector_name(self) -> str:
+        """Get the name of the vector for the Qdrant collection."""
+        return self.provider.get_vector_name()
+
+    def get_vector_size(self) -> int:
+        """Get the size of the vector for the Qdrant collection."""
+        return self.provider.get_vector_size()
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        task = asyncio.create_task(self._embed_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _embed_batch(
+        self, batch: dict[str, list[asyncio.Future[np.ndarray]]]
+    ) -> None:
+        queries = list(batch)
+        logger.debug("Embedding a batch of %d queries", len(queries))
+        try:
+            embeddings = await self.provider.embed_queries_array(queries)
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for futures, embedding in zip(batch.values(), embeddings):
+            for future in futures:
+                # The caller may have been cancelled while waiting
+                if not future.done():
+                    future.set_result(embedding)
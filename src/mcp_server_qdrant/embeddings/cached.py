@@ -0,0 +1,118 @@
+import re
+import unicodedata
+
+import numpy as np
+
+from mcp_server_qdrant.common.lru import CacheStats, LRUCache
+from mcp_server_qdrant.embeddings.base import EmbeddingProvider
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize the query text, so trivially different spellings of the same query share a cache entry.
+    Case is preserved, as it may change the embedding.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", query)).strip()
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """
+    Wraps another embedding provider and caches the query embeddings in memory.
+    Entries are keyed by the model name and the normalized query text, evicted in LRU order
+    and expire after the configured time-to-live. Document embeddings are not cached.
+    :param provider: The embedding provider to wrap.
+    :param max_entries: The maximum number of query embeddings to keep.
+    :param max_bytes: The maximum memory used by the cached vectors, in bytes. None means unbounded.
+    :param ttl: The number of seconds a cached embedding stays valid. None means no expiration.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        max_entries: int,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+    ):
+        self.provider = provider
+        self.model_name = getattr(provider, "model_name", type(provider).__name__)
+        self._cache: LRUCache[tuple[str, str], np.ndarray] = LRUCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl=ttl,
+            sizeof=lambda vector: vector.nbytes,
+        )
+
+    async def embed_documents(self, documents: list[str]) -> list[list[float]]:
+        """Embed a list of documents into vectors."""
+        return await self.provider.embed_documents(documents)
+
+    async def embed_documents_array(self, documents: list[str]) -> np.ndarray:
+        """Embed a list of documents into a float32 array."""
+        return await self.provider.embed_documents_array(documents)
+
+    async def embed_query(self, query: str) -> list[float]:
+        """Embed a query into a vector, reusing a cached embedding if there is one."""
+        return (await self.embed_query_array(query)).tolist()
+
+    async def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """Embed several queries, reusing the cached embeddings."""
+        return (await self.embed_queries_array(queries)).tolist()
+
+    async def embed_query_array(self, query: str) -> np.ndarray:
+        """Embed a query into a float32 array, reusing a cached embedding if there is one."""
+        key = (self.model_name, normalize_query(query))
+        vector = self._cache.get(key)
+        if vector is None:
+            vector = self._freeze(await self.provider.embed_query_array(query))
+            self._cache.put(key, vector)
+        return vector
+
+    async def embed_queries_array(self, queries: list[str]) -> np.ndarray:
+        """Embed several queries, only passing the ones missing from the cache to the provider."""
+        keys = [(self.model_name, normalize_query(query)) for query in queries]
+        vectors = [self._cache.get(key) for key in keys]
+        missing = {
+            key: query
+            for key, query, vector in zip(keys, queries, vectors)
+            if vector is None
+        }
+        if missing:
+            embeddings = await self.provider.embed_queries_array(list(missing.values()))
+            computed = {
+                key: self._freeze(embedding)
+                for key, embedding in zip(missing, embeddings)
+            }
+            for key, vector in computed.items():
+                self._cache.put(key, vector)
+            vectors = [
+                vector if vector is not None else computed[key]
+                for key, vector in zip(keys, vectors)
+            ]
+        if not vectors:
+            return np.empty((0, self.get_vector_size()), dtype=np.float32)
+        return np.stack(vectors)  # type: ignore[arg-type]
+
+    async def token_spans(self, text: str) -> list[tuple[int, int]]:
+        """Split the text into the tokens of the wrapped provider's model."""
+        return await self.provider.token_spans(text)
+
+    def get_vector_name(self) -> str:
+        """Get the name of the vector for the Qdrant collection."""
+        return self.provider.get_vector_name()
+
+    def get_vector_size(self) -> int:
+        """Get the size of the vector for the Qdrant collection."""
+        return self.provider.get_vector_size()
+
+    @staticmethod
+    def _freeze(vector: np.ndarray) -> np.ndarray:
+        # Cached vectors are shared between the callers, so they must not be modified in place
+        vector = np.array(vector, dtype=np.float32)
+        vector.flags.writeable = False
+        return vector
+
+    def cache_stats(self) -> CacheStats:
+        """Get the hit, miss and eviction counters of the query cache."""
+        return self._cache.stats()
@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Awaitable, Callable, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of host parameters in a single statement.
+_MAX_QUERY_PARAMETERS = 500
+
+
+class DocumentEmbeddingCache:
+    """
+    Persistent cache of document embeddings, stored in a SQLite database.
+    Each embedding is stored as a float32 blob, keyed by a hash of the provider namespace
+    (provider type and model) and the document text, so it survives server restarts and
+    repeated ingests of the same content.
+    :param path: The path to the SQLite database file. It is created if it does not exist.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key BLOB PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+            )
+            self._connection.commit()
+
+    @staticmethod
+    def make_key(namespace: str, document: str) -> bytes:
+        """
+        Compute the cache key of a document.
+        :param namespace: Identifies the provider and the model, e.g. "fastembed/BAAI/bge-small-en".
+        :param document: The document text.
+        """
+        digest = hashlib.sha256()
+        digest.update(namespace.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(document.encode("utf-8"))
+        return digest.digest()
+
+    def get_many(
+        self, namespace: str, documents: Sequence[str]
+    ) -> list[np.ndarray | None]:
+        """
+        Look up the cached embeddings of the documents.
+        :param namespace: Identifies the provider and the model.
+        :param documents: The documents to look up.
+        :return: The cached float32 vectors, in the order of the documents, None for the missing ones.
+        """
+        keys = [self.make_key(namespace, document) for document in documents]
+        found: dict[bytes, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(keys), _MAX_QUERY_PARAMETERS):
+                chunk = keys[start : start + _MAX_QUERY_PARAMETERS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, dim, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    if vector.shape[0] == dim:
+                        found[key] = vector
+        return [found.get(key) for key in keys]
+
+    def put_many(
+        self,
+        namespace: str,
+        documents: Sequence[str],
+        vectors: Sequence[Sequence[float] | np.ndarray] | np.ndarray,
+    ) -> None:
+        """
+        Store the embeddings of the documents.
+        :param namespace: Identifies the provider and the model.
+        :param documents: The embedded documents.
+        :param vectors: The embeddings, in the order of the documents.
+        """
+        rows = []
+        for document, vector in zip(documents, vectors, strict=True):
+            array = np.asarray(vector, dtype=np.float32)
+            rows.append(
+                (self.make_key(namespace, document), array.shape[0], array.tobytes())
+            )
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._connection.commit()
+
+    async def get_or_embed(
+        self,
+        namespace: str,
+        documents: list[str],
+        embed: Callable[[list[str]], Awaitable[np.ndarray]],
+    ) -> np.ndarray:
+        """
+        Return the embeddings of the documents, computing and storing only the ones which are not cached yet.
+        :param namespace: Identifies the provider and the model.
+        :param documents: The documents to embed.
+        :param embed: The function computing the float32 embeddings of a list of documents.
+        :return: A float32 array of shape (len(documents), dim), in the order of the documents.
+        """
+        # The SQLite queries are blocking, so they run in a thread, off the event loop
+        cached = await asyncio.to_thread(self.get_many, namespace, documents)
+        # Deduplicate the missing documents, so repeated texts are embedded once
+        missing = list(
+            dict.fromkeys(
+                document
+                for document, vector in zip(documents, cached)
+                if vector is None
+            )
+        )
+        computed: dict[str, np.ndarray] = {}
+        if missing:
+            logger.debug(
+                "Document embedding cache: %d hits, %d misses",
+                len(documents) - len(missing),
+                len(missing),
+            )
+            embeddings = await embed(missing)
+            await asyncio.to_thread(self.put_many, namespace, missing, embeddings)
+            computed = dict(zip(missing, embeddings))
+
+        if not documents:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack(
+            [
+                vector if vector is not None else computed[document]
+                for document, vector in zip(documents, cached)
+            ]
+        ).astype(np.float32, copy=False)
+
+    def close(self) -> None:
+        """
+        Close the underlying database connection.
+        """
+        with self._lock:
+            self._connection.close()
@@ -1,21 +1,97 @@
 from mcp_server_qdrant.embeddings.base import EmbeddingProvider
+from mcp_server_qdrant.embeddings.sparse import SparseEmbeddingProvider
 from mcp_server_qdrant.embeddings.types import EmbeddingProviderType
 from mcp_server_qdrant.settings import EmbeddingProviderSettings
 
 
-def create_embedding_provider(settings: EmbeddingProviderSettings) -> EmbeddingProvider:
+def create_embedding_provider(
+    settings: EmbeddingProviderSettings,
+) -> EmbeddingProvider | None:
     """
     Create an embedding provider based on the specified type.
     :param settings: The settings for the embedding provider.
-    :return: An instance of the specified embedding provider.
+    :return: An instance of the specified embedding provider, or None for the sparse-only provider type.
     """
+    if settings.provider_type == EmbeddingProviderType.FASTEMBED_SPARSE:
+        # No dense model is loaded, see create_sparse_embedding_provider
+        return None
+
+    document_cache = None
+    if settings.document_cache_path:
+        from mcp_server_qdrant.embeddings.document_cache import DocumentEmbeddingCache
+
+        document_cache = DocumentEmbeddingCache(settings.document_cache_path)
+
+    provider: EmbeddingProvider
     if settings.provider_type == EmbeddingProviderType.FASTEMBED:
         from mcp_server_qdrant.embeddings.fastembed import FastEmbedProvider
 
-        return FastEmbedProvider(settings.model_name)
+        provider = FastEmbedProvider(
+            settings.model_name,
+            document_cache=document_cache,
+            threads=settings.threads,
+            executor=settings.executor,
+            workers=settings.executor_workers,
+            bulk_parallel=settings.bulk_parallel,
+            bulk_batch_size=settings.bulk_batch_size,
+            bulk_threshold=settings.bulk_threshold,
+            load_mode=settings.load_mode,
+            warmup=settings.warmup,
+            idle_timeout=settings.idle_timeout,
+        )
     elif settings.provider_type == EmbeddingProviderType.OPENAI:
         from mcp_server_qdrant.embeddings.openai import OpenAIProvider
 
-        return OpenAIProvider(settings.model_name)
+        provider = OpenAIProvider(
+            settings.model_name,
+            document_cache=document_cache,
+            max_batch_tokens=settings.max_batch_tokens,
+            max_batch_size=settings.max_batch_size,
+            max_concurrent_requests=settings.max_concurrent_requests,
+            max_retries=settings.max_retries,
+            dimensions=settings.dimensions,
+        )
     else:
         raise ValueError(f"Unsupported embedding provider: {settings.provider_type}")
+
+    if settings.query_batch_window_ms > 0:
+        from mcp_server_qdrant.embeddings.batching import BatchingEmbeddingProvider
+
+        provider = BatchingEmbeddingProvider(
+            provider,
+            window_ms=settings.query_batch_window_ms,
+            max_batch_size=settings.query_batch_max_size,
+        )
+
+    # The cache wraps the batching layer, so cache hits never wait for a batch window
+    if settings.query_cache_size > 0:
+        from mcp_server_qdrant.embeddings.cached import CachedEmbeddingProvider
+
+        provider = CachedEmbeddingProvider(
+            provider,
+            max_entries=settings.query_cache_size,
+            max_bytes=settings.query_cache_max_bytes,
+            ttl=settings.query_cache_ttl,
+        )
+
+    return provider
+
+
+def create_sparse_embedding_provider(
+    settings: EmbeddingProviderSettings,
+) -> SparseEmbeddingProvider | None:
+    """
+    Create the sparse embedding provider, if a sparse model is configured for hybrid search
+    or if the provider type is sparse-only.
+    :param settings: The settings for the embedding provider.
+    :return: The sparse embedding provider, or None if sparse vectors are not used.
+    """
+    if settings.provider_type == EmbeddingProviderType.FASTEMBED_SPARSE:
+        model_name = settings.model_name
+    elif settings.sparse_model_name:
+        model_name = settings.sparse_model_name
+    else:
+        return None
+    from mcp_server_qdrant.embeddings.sparse import FastEmbedSparseProvider
+
+    return FastEmbedSparseProvider(model_name, threads=settings.threads)
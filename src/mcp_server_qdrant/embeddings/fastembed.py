@@ -1,50 +1,447 @@
 import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable, Literal
 
-from fastembed import TextEmbedding
-from fastembed.common.model_description import DenseModelDescription
+import numpy as np
 
 from mcp_server_qdrant.embeddings.base import EmbeddingProvider
+from mcp_server_qdrant.embeddings.document_cache import DocumentEmbeddingCache
+
+if TYPE_CHECKING:
+    from fastembed import TextEmbedding
+    from tokenizers import Tokenizer
+
+logger = logging.getLogger(__name__)
+
+ExecutorType = Literal["thread", "process"]
+LoadMode = Literal["eager", "background", "lazy"]
+
+# The model loaded in a worker process of the process pool executor
+_worker_model: "TextEmbedding | None" = None
+_worker_tokenizer: "Tokenizer | None" = None
+
+
+def _load_model(model_name: str, threads: int | None) -> "TextEmbedding":
+    # qdrant_client already imports FastEmbed along with the server, so the cost deferred here is the
+    # loading of the model, not the import
+    from fastembed import TextEmbedding
+
+    return TextEmbedding(model_name, threads=threads)
+
+
+def _init_worker(model_name: str, threads: int | None, warmup: bool = False) -> None:
+    global _worker_model
+    _worker_model = _load_model(model_name, threads)
+    if warmup:
+        _warm_up(_worker_model)
+
+
+def _warm_up(model: "TextEmbedding") -> None:
+    # The first inference initializes and optimizes the ONNX session, so it is
+    # paid at startup instead of by the first query
+    _embed(model, "query", ["warm-up"])
+    _embed(model, "passage", ["warm-up"])
+
+
+def _embed(
+    model: "TextEmbedding",
+    kind: Literal["passage", "query"],
+    texts: list[str],
+    batch_size: int = 256,
+    parallel: int | None = None,
+) -> np.ndarray:
+    if kind == "passage":
+        embeddings: Iterable[np.ndarray] = model.passage_embed(
+            texts, batch_size=batch_size, parallel=parallel
+        )
+    else:
+        embeddings = model.query_embed(texts)
+    return np.stack(list(embeddings)).astype(np.float32, copy=False)
+
+
+def _embed_in_worker(kind: Literal["passage", "query"], texts: list[str]) -> np.ndarray:
+    assert _worker_model is not None, "The worker process was not initialized"
+    return _embed(_worker_model, kind, texts)
+
+
+def _untruncated_tokenizer(model: "TextEmbedding") -> "Tokenizer":
+    from tokenizers import Tokenizer
+
+    # The tokenizer of the model truncates to the maximal input length, so a copy is used
+    tokenizer = Tokenizer.from_str(model.model.tokenizer.to_str())
+    tokenizer.no_truncation()
+    tokenizer.no_padding()
+    return tokenizer
+
+
+def _token_spans(tokenizer: "Tokenizer", text: str) -> list[tuple[int, int]]:
+    encoding = tokenizer.encode(text, add_special_tokens=False)
+    return [(start, end) for start, end in encoding.offsets if end > start]
+
+
+def _token_spans_in_worker(text: str) -> list[tuple[int, int]]:
+    global _worker_tokenizer
+    assert _worker_model is not None, "The worker process was not initialized"
+    if _worker_tokenizer is None:
+        _worker_tokenizer = _untruncated_tokenizer(_worker_model)
+    return _token_spans(_worker_tokenizer, text)
+
+
+def _ping_worker() -> bool:
+    return _worker_model is not None
 
 
 class FastEmbedProvider(EmbeddingProvider):
     """
     FastEmbed implementation of the embedding provider.
+    Inference runs on a dedicated executor, so it does not compete with the other blocking tasks
+    of the server. With the thread executor, the model is loaded once and shared by the threads;
+    with the process executor, each worker process loads its own copy of the model.
+    The model is loaded in the constructor by default. With the "background" load mode it is loaded
+    by a background thread, and with the "lazy" load mode on first use; in both cases the embedding
+    calls wait until the model is ready, so the server can answer the MCP handshake right away.
+    With an idle timeout, the model is released once it has not been used for that long, and
+    loaded again by the next embedding call.
     :param model_name: The name of the FastEmbed model to use.
+    :param document_cache: A persistent cache of document embeddings, optional.
+    :param threads: The number of ONNX intra-op threads of each model. If not provided, the cores
+                    are split evenly between the workers.
+    :param executor: The kind of executor running the inference, "thread" or "process".
+    :param workers: The number of threads or processes of the executor.
+    :param bulk_parallel: Enables the bulk encoding mode for large document lists. It is the number of
+                          processes FastEmbed spreads the encoding across, 0 meaning all the cores.
+                          None disables the bulk mode.
+    :param bulk_batch_size: The batch size used by the bulk encoding mode.
+    :param bulk_threshold: The minimal number of documents for a call to use the bulk encoding mode.
+    :param load_mode: When the model is loaded, "eager", "background" or "lazy".
+    :param warmup: Run a warm-up inference right after the model is loaded at startup.
+                   It has no effect with the "lazy" load mode.
+    :param idle_timeout: The number of seconds after which an unused model is released, optional.
     """
 
-    def __init__(self, model_name: str):
+    def __init__(
+        self,
+        model_name: str,
+        document_cache: DocumentEmbeddingCache | None = None,
+        threads: int | None = None,
+        executor: ExecutorType = "thread",
+        workers: int = 1,
+        bulk_parallel: int | None = None,
+        bulk_batch_size: int = 256,
+        bulk_threshold: int = 512,
+        load_mode: LoadMode = "eager",
+        warmup: bool = False,
+        idle_timeout: float | None = None,
+    ):
+        if workers <= 0:
+            raise ValueError("workers must be a positive number")
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unsupported executor type: {executor}")
+        if load_mode not in ("eager", "background", "lazy"):
+            raise ValueError(f"Unsupported load mode: {load_mode}")
+        if idle_timeout is not None and idle_timeout <= 0:
+            raise ValueError("idle_timeout must be a positive number")
         self.model_name = model_name
-        self.embedding_model = TextEmbedding(model_name)
+        self.document_cache = document_cache
+        if threads is None and workers > 1:
+            # Avoid oversubscribing the cores with ONNX threads of several workers
+            threads = max(1, (os.cpu_count() or 1) // workers)
+        self.threads = threads
+        self.bulk_parallel = bulk_parallel
+        self.bulk_batch_size = bulk_batch_size
+        self.bulk_threshold = bulk_threshold
+        self.warmup = warmup
+        self.idle_timeout = idle_timeout
+        # Bulk encoding runs on its own thread, so it does not delay the latency-sensitive calls
+        self._bulk_executor: ThreadPoolExecutor | None = None
+        self._vector_size: int | None = None
+
+        self._model: "TextEmbedding | None" = None
+        self._tokenizer: "Tokenizer | None" = None
+        self._model_lock = threading.Lock()
+        self._use_processes = executor == "process"
+        self._workers = workers
+        self._workers_started = False
+        self._executor: Executor
+        if self._use_processes:
+            self._executor = self._new_process_pool(warmup)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="fastembed"
+            )
+
+        # Tracks the embedding calls, so the idle monitor never releases a model in use
+        self._usage_lock = threading.Lock()
+        self._in_flight = 0
+        self._last_used = time.monotonic()
+        self._closed = threading.Event()
+
+        if self._use_processes:
+            if load_mode != "lazy":
+                self._start_workers()
+        elif load_mode == "eager":
+            model = self._get_model()
+            if warmup:
+                _warm_up(model)
+        elif load_mode == "background":
+            threading.Thread(
+                target=self._preload, name="fastembed-loader", daemon=True
+            ).start()
+
+        if idle_timeout is not None:
+            threading.Thread(
+                target=self._watch_idle, name="fastembed-idle", daemon=True
+            ).start()
+
+    @property
+    def embedding_model(self) -> "TextEmbedding | None":
+        """
+        The model used by the thread executor, loaded if necessary.
+        It is None with the process executor, as the model lives in the worker processes.
+        """
+        if self._use_processes:
+            return None
+        return self._get_model()
+
+    def is_ready(self) -> bool:
+        """Check whether the model is loaded, so an embedding call would not wait for it."""
+        if self._use_processes:
+            return True
+        return self._model is not None
+
+    def _get_model(self) -> "TextEmbedding":
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    logger.info("Loading the FastEmbed model %s", self.model_name)
+                    self._model = _load_model(self.model_name, self.threads)
+                    self._last_used = time.monotonic()
+        return self._model
+
+    def _preload(self) -> None:
+        try:
+            model = self._get_model()
+            if self.warmup:
+                _warm_up(model)
+        except Exception:
+            # The error is raised again on first use
+            logger.exception("Could not load the FastEmbed model %s", self.model_name)
+
+    def _start_workers(self) -> None:
+        # The worker processes load the model in their initializer
+        for _ in range(self._workers):
+            self._executor.submit(_ping_worker)
+        self._workers_started = True
+
+    def _new_process_pool(self, warmup: bool) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.model_name, self.threads, warmup),
+        )
+
+    def _acquire(self) -> Executor:
+        with self._usage_lock:
+            self._in_flight += 1
+            self._last_used = time.monotonic()
+            # The pool of worker processes may have been replaced by the idle monitor
+            self._workers_started = True
+            return self._executor
+
+    def _release(self) -> None:
+        with self._usage_lock:
+            self._in_flight -= 1
+            self._last_used = time.monotonic()
+
+    def _watch_idle(self) -> None:
+        assert self.idle_timeout is not None
+        interval = min(self.idle_timeout / 2, 60.0)
+        while not self._closed.wait(interval):
+            self._unload_if_idle()
+
+    def _unload_if_idle(self) -> bool:
+        """
+        Release the model if it has not been used for longer than the idle timeout.
+        :return: Whether the model was released.
+        """
+        if self.idle_timeout is None:
+            return False
+        with self._usage_lock:
+            idle_for = time.monotonic() - self._last_used
+            if self._in_flight or idle_for < self.idle_timeout:
+                return False
+            if self._use_processes:
+                if not self._workers_started:
+                    return False
+                # Stopping the workers releases their models, the new pool starts its
+                # workers on the next submitted call. It is never warmed up.
+                retired = self._executor
+                self._executor = self._new_process_pool(warmup=False)
+                self._workers_started = False
+            else:
+                if self._model is None:
+                    return False
+                self._model = None
+                retired = None
+        logger.info(
+            "Releasing the FastEmbed model %s, idle for %.0f seconds",
+            self.model_name,
+            idle_for,
+        )
+        if retired is not None:
+            retired.shutdown(wait=False, cancel_futures=True)
+        return True
 
     async def embed_documents(self, documents: list[str]) -> list[list[float]]:
         """Embed a list of documents into vectors."""
-        # Run in a thread pool since FastEmbed is synchronous
-        loop = asyncio.get_event_loop()
-        embeddings = await loop.run_in_executor(
-            None, lambda: list(self.embedding_model.passage_embed(documents))
+        return (await self.embed_documents_array(documents)).tolist()
+
+    async def embed_documents_array(self, documents: list[str]) -> np.ndarray:
+        """Embed a list of documents into a float32 array of shape (len(documents), dim)."""
+        if self.document_cache is None:
+            return await self._embed_documents(documents)
+        return await self.document_cache.get_or_embed(
+            f"fastembed/{self.model_name}", documents, self._embed_documents
         )
-        return [embedding.tolist() for embedding in embeddings]
+
+    async def _embed_documents(self, documents: list[str]) -> np.ndarray:
+        if self.bulk_parallel is None or len(documents) < self.bulk_threshold:
+            return await self._run("passage", documents)
+        return await self._run_bulk(documents)
 
     async def embed_query(self, query: str) -> list[float]:
         """Embed a query into a vector."""
-        # Run in a thread pool since FastEmbed is synchronous
-        loop = asyncio.get_event_loop()
-        embeddings = await loop.run_in_executor(
-            None, lambda: list(self.embedding_model.query_embed([query]))
+        return (await self.embed_query_array(query)).tolist()
+
+    async def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """Embed several queries with a single inference call."""
+        return (await self.embed_queries_array(queries)).tolist()
+
+    async def embed_query_array(self, query: str) -> np.ndarray:
+        """Embed a query into a float32 array of shape (dim,)."""
+        embeddings = await self.embed_queries_array([query])
+        return embeddings[0]
+
+    async def embed_queries_array(self, queries: list[str]) -> np.ndarray:
+        """Embed several queries with a single inference call."""
+        return await self._run("query", queries)
+
+    async def _run(
+        self, kind: Literal["passage", "query"], texts: list[str]
+    ) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.get_vector_size()), dtype=np.float32)
+        # Run in the dedicated executor since FastEmbed is synchronous
+        loop = asyncio.get_running_loop()
+        executor = self._acquire()
+        try:
+            if self._use_processes:
+                return await loop.run_in_executor(
+                    executor, _embed_in_worker, kind, texts
+                )
+            return await loop.run_in_executor(executor, self._embed_sync, kind, texts)
+        finally:
+            self._release()
+
+    def _embed_sync(
+        self,
+        kind: Literal["passage", "query"],
+        texts: list[str],
+        batch_size: int = 256,
+        parallel: int | None = None,
+    ) -> np.ndarray:
+        # Loading the model here makes the executor threads wait for it, not the event loop
+        return _embed(self._get_model(), kind, texts, batch_size, parallel)
+
+    async def token_spans(self, text: str) -> list[tuple[int, int]]:
+        """Split the text into the tokens of the model, with no truncation."""
+        loop = asyncio.get_running_loop()
+        executor = self._acquire()
+        try:
+            if self._use_processes:
+                return await loop.run_in_executor(
+                    executor, _token_spans_in_worker, text
+                )
+            return await loop.run_in_executor(executor, self._token_spans_sync, text)
+        finally:
+            self._release()
+
+    def _token_spans_sync(self, text: str) -> list[tuple[int, int]]:
+        if self._tokenizer is None:
+            self._tokenizer = _untruncated_tokenizer(self._get_model())
+        return _token_spans(self._tokenizer, text)
+
+    async def _run_bulk(self, documents: list[str]) -> np.ndarray:
+        self._acquire()
+        try:
+            return await self._run_bulk_acquired(documents)
+        finally:
+            self._release()
+
+    async def _run_bulk_acquired(self, documents: list[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        if self._use_processes:
+            # The worker processes cannot start processes of their own, but the pool
+            # itself is data-parallel, so the batches are spread across its workers
+            batches = [
+                documents[start : start + self.bulk_batch_size]
+                for start in range(0, len(documents), self.bulk_batch_size)
+            ]
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        self._executor, _embed_in_worker, "passage", batch
+                    )
+                    for batch in batches
+                )
+            )
+            return np.concatenate(results)
+
+        if self._bulk_executor is None:
+            self._bulk_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="fastembed-bulk"
+            )
+        return await loop.run_in_executor(
+            self._bulk_executor,
+            self._embed_sync,
+            "passage",
+            documents,
+            self.bulk_batch_size,
+            self.bulk_parallel,
         )
-        return embeddings[0].tolist()
 
     def get_vector_name(self) -> str:
         """
         Return the name of the vector for the Qdrant collection.
         Important: This is compatible with the FastEmbed logic used before 0.6.0.
         """
-        model_name = self.embedding_model.model_name.split("/")[-1].lower()
+        model_name = self.model_name.split("/")[-1].lower()
         return f"fast-{model_name}"
 
     def get_vector_size(self) -> int:
         """Get the size of the vector for the Qdrant collection."""
-        model_description: DenseModelDescription = (
-            self.embedding_model._get_model_description(self.model_name)
-        )
-        return model_description.dim
+        if self._vector_size is None:
+            # The model description is known without loading the model
+            from fastembed import TextEmbedding
+            from fastembed.common.model_description import DenseModelDescription
+
+            model_description: DenseModelDescription = (
+                TextEmbedding._get_model_description(self.model_name)
+            )
+            if model_description.dim is None:
+                raise ValueError(f"Unknown vector size of the model {self.model_name}")
+            self._vector_size = model_description.dim
+        return self._vector_size
+
+    def close(self) -> None:
+        """Shut down the executors running the inference."""
+        self._closed.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._bulk_executor is not None:
+            self._bulk_executor.shutdown(wait=False, cancel_futures=True)
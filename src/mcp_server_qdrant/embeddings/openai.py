@@ -1,44 +1,102 @@
+import asyncio
+import base64
+import logging
 import os
+import random
+import time
+import weakref
 from typing import Optional
 
+import numpy as np
+
 try:
+    import openai
     from openai import AsyncOpenAI
 except ImportError:
-    raise ImportError(
-        "OpenAI package not found. Install it with: pip install openai"
-    )
+    raise ImportError("OpenAI package not found. Install it with: pip install openai")
+
+try:
+    import tiktoken  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - the token counts are approximated without it
+    tiktoken = None  # type: ignore[assignment]
 
 from mcp_server_qdrant.embeddings.base import EmbeddingProvider
+from mcp_server_qdrant.embeddings.document_cache import DocumentEmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+# Hard limits of the embeddings endpoint
+MAX_INPUTS_PER_REQUEST = 2048
+MAX_TOKENS_PER_REQUEST = 300_000
+
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
 
 
 class OpenAIProvider(EmbeddingProvider):
     """
     OpenAI implementation of the embedding provider.
+    Large inputs are split into batches fitting the token budget of a single request, which are sent
+    concurrently, with a bounded number of requests in flight. Rate-limited requests are retried with
+    an exponential backoff, and all the requests pause while the rate limit is in effect.
+    Embeddings are transferred base64-encoded and decoded straight into float32 buffers.
     :param model_name: The name of the OpenAI embedding model to use.
     :param api_key: OpenAI API key. If not provided, will try to get from OPENAI_API_KEY environment variable.
+    :param document_cache: A persistent cache of document embeddings, optional.
+    :param max_batch_tokens: The maximum number of tokens sent in a single request.
+    :param max_batch_size: The maximum number of inputs sent in a single request.
+    :param max_concurrent_requests: The maximum number of requests in flight.
+    :param max_retries: How many times a failed request is retried.
+    :param dimensions: The number of dimensions of the embeddings, optional. Only the text-embedding-3
+                       models support it, they return shortened (Matryoshka) embeddings.
     """
 
-    def __init__(self, model_name: str, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model_name: str,
+        api_key: Optional[str] = None,
+        document_cache: Optional[DocumentEmbeddingCache] = None,
+        max_batch_tokens: int = 100_000,
+        max_batch_size: int = MAX_INPUTS_PER_REQUEST,
+        max_concurrent_requests: int = 4,
+        max_retries: int = 5,
+        dimensions: Optional[int] = None,
+    ):
         self.model_name = model_name
-        
+        self.document_cache = document_cache
+        self.max_batch_tokens = min(max_batch_tokens, MAX_TOKENS_PER_REQUEST)
+        self.max_batch_size = min(max_batch_size, MAX_INPUTS_PER_REQUEST)
+        self.max_retries = max_retries
+        self._max_concurrent_requests = max_concurrent_requests
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+        # Monotonic time until which no request should be sent, set on rate limit errors
+        self._cooldown_until = 0.0
+
         # Get API key from parameter or environment
         if api_key is None:
             api_key = os.getenv("OPENAI_API_KEY")
-        
+
         if not api_key:
             raise ValueError(
                 "OpenAI API key is required. Provide it as a parameter or set OPENAI_API_KEY environment variable."
             )
-        
-        self.client = AsyncOpenAI(api_key=api_key)
-        
+
+        # Retries are handled by the provider, so the rate limit is shared by all the requests
+        self.client = AsyncOpenAI(api_key=api_key, max_retries=0)
+
         # Model-specific dimensions mapping
         self._model_dimensions = {
             "text-embedding-3-small": 1536,
             "text-embedding-3-large": 3072,
             "text-embedding-ada-002": 1536,
         }
-        
+
         # Validate model
         if model_name not in self._model_dimensions:
             raise ValueError(
@@ -46,23 +104,73 @@ class OpenAIProvider(EmbeddingProvider):
                 f"Supported models: {list(self._model_dimensions.keys())}"
             )
 
+        if dimensions is not None:
+            if not model_name.startswith("text-embedding-3"):
+                raise ValueError(
+                    f"The {model_name} model does not support custom dimensions"
+                )
+            if not 0 < dimensions <= self._model_dimensions[model_name]:
+                raise ValueError(
+                    f"dimensions must be between 1 and {self._model_dimensions[model_name]} "
+                    f"for the {model_name} model"
+                )
+        self.dimensions = dimensions
+
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(model_name)
+            except Exception:  # the encoding files may not be available offline
+                logger.debug("Falling back to approximate token counts")
+
     async def embed_documents(self, documents: list[str]) -> list[list[float]]:
         """Embed a list of documents into vectors."""
-        response = await self.client.embeddings.create(
-            input=documents,
-            model=self.model_name
+        return (await self.embed_documents_array(documents)).tolist()
+
+    async def embed_documents_array(self, documents: list[str]) -> np.ndarray:
+        """Embed a list of documents into a float32 array of shape (len(documents), dim)."""
+        if self.document_cache is None:
+            return await self._embed(documents)
+        # Shortened embeddings are not interchangeable with the full ones
+        namespace = f"openai/{self.model_name}"
+        if self.dimensions is not None:
+            namespace += f"/{self.dimensions}"
+        return await self.document_cache.get_or_embed(namespace, documents, self._embed)
+
+    async def _embed(self, texts: list[str]) -> np.ndarray:
+        """
+        Embed the texts into a float32 matrix of shape (len(texts), dim).
+        """
+        batches = self._make_batches(texts)
+        results = await asyncio.gather(
+            *(self._create_embeddings([texts[i] for i in batch]) for batch in batches)
         )
-        
-        return [embedding.embedding for embedding in response.data]
+
+        if not results:
+            return np.empty((0, self.get_vector_size()), dtype=np.float32)
+
+        # Restore the original order of the texts
+        embeddings = np.empty((len(texts), results[0].shape[1]), dtype=np.float32)
+        for batch, batch_embeddings in zip(batches, results):
+            embeddings[batch] = batch_embeddings
+        return embeddings
 
     async def embed_query(self, query: str) -> list[float]:
         """Embed a query into a vector."""
-        response = await self.client.embeddings.create(
-            input=[query],
-            model=self.model_name
-        )
-        
-        return response.data[0].embedding
+        return (await self.embed_query_array(query)).tolist()
+
+    async def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """Embed several queries with as few API requests as possible."""
+        return (await self.embed_queries_array(queries)).tolist()
+
+    async def embed_query_array(self, query: str) -> np.ndarray:
+        """Embed a query into a float32 array of shape (dim,)."""
+        embeddings = await self._embed([query])
+        return embeddings[0]
+
+    async def embed_queries_array(self, queries: list[str]) -> np.ndarray:
+        """Embed several queries into a float32 array of shape (len(queries), dim)."""
+        return await self._embed(queries)
 
     def get_vector_name(self) -> str:
         """Get the name of the vector for the Qdrant collection."""
@@ -72,4 +180,109 @@ class OpenAIProvider(EmbeddingProvider):
 
     def get_vector_size(self) -> int:
         """Get the size of the vector for the Qdrant collection."""
-        return self._model_dimensions[self.model_name]
\ No newline at end of file
+        if self.dimensions is not None:
+            return self.dimensions
+        return self._model_dimensions[self.model_name]
+
+    async def token_spans(self, text: str) -> list[tuple[int, int]]:
+        """
+        Split the text into the tokens of the model. Without the `tiktoken` encoding, the tokens are approximated.
+        """
+        if self._encoding is None:
+            return await super().token_spans(text)
+        tokens = self._encoding.encode(text, disallowed_special=())
+        _, starts = self._encoding.decode_with_offsets(tokens)
+        return list(zip(starts, starts[1:] + [len(text)]))
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Count the tokens of the text. Without the `tiktoken` encoding of the model, e.g. offline, the count is
+        an upper bound: the byte-level tokens of the OpenAI models never outnumber the UTF-8 bytes of the text.
+        """
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return len(text.encode("utf-8"))
+
+    def _make_batches(self, texts: list[str]) -> list[list[int]]:
+        """
+        Split the texts into batches respecting the token and input limits of a request.
+        :return: The indices of the texts in each batch.
+        """
+        batches: list[list[int]] = []
+        current: list[int] = []
+        current_tokens = 0
+        for index, text in enumerate(texts):
+            tokens = self.count_tokens(text)
+            if current and (
+                current_tokens + tokens > self.max_batch_tokens
+                or len(current) >= self.max_batch_size
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to the event loop they are first used in
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self._max_concurrent_requests)
+        return self._semaphores[loop]
+
+    async def _create_embeddings(self, inputs: list[str]) -> np.ndarray:
+        async with self._semaphore():
+            attempt = 0
+            while True:
+                delay = self._cooldown_until - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    response = await self.client.embeddings.create(
+                        input=inputs,
+                        model=self.model_name,
+                        encoding_format="base64",
+                        dimensions=self.dimensions
+                        if self.dimensions is not None
+                        else openai.NOT_GIVEN,
+                    )
+                    return self._decode(response.data)
+                except _RETRYABLE_ERRORS as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = self._retry_delay(e, attempt)
+                    logger.warning(
+                        "OpenAI embeddings request failed (%s), retrying in %.1fs",
+                        type(e).__name__,
+                        delay,
+                    )
+                    if isinstance(e, openai.RateLimitError):
+                        # Pause the other requests as well, they would hit the same limit
+                        self._cooldown_until = max(
+                            self._cooldown_until, time.monotonic() + delay
+                        )
+                    await asyncio.sleep(delay)
+                    attempt += 1
+
+    @staticmethod
+    def _decode(data: list) -> np.ndarray:
+        """
+        Decode the base64-encoded embeddings into a float32 matrix, without going through Python floats.
+        """
+        # The response items may come in any order, the index says where they belong
+        data = sorted(data, key=lambda item: item.index)
+        buffer = b"".join(base64.b64decode(item.embedding) for item in data)
+        return np.frombuffer(buffer, dtype=np.float32).reshape(len(data), -1)
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        if isinstance(error, openai.APIStatusError):
+            retry_after = error.response.headers.get("retry-after")
+            if retry_after is not None:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass
+        return min(0.5 * 2**attempt, 30.0) * (1 + random.random() / 4)
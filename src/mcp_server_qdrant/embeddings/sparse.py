@@ -0,0 +1,129 @@
+import asyncio
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from qdrant_client import models
+
+from mcp_server_qdrant.embeddings.base import approximate_token_spans
+
+
+def _load_model(model_name: str, threads: int | None):
+    # qdrant_client already imports FastEmbed along with the server, so the cost deferred here is the
+    # loading of the model, not the import
+    from fastembed import SparseTextEmbedding
+
+    return SparseTextEmbedding(model_name, threads=threads)
+
+
+class SparseEmbeddingProvider(ABC):
+    """
+    Abstract base class for sparse embedding providers, such as BM25 or SPLADE.
+    Sparse vectors weight the terms of a text, so they retrieve exact terms and names
+    which dense embeddings tend to miss.
+    """
+
+    @abstractmethod
+    async def embed_documents(self, documents: list[str]) -> list[models.SparseVector]:
+        """Embed a list of documents into sparse vectors."""
+        pass
+
+    @abstractmethod
+    async def embed_query(self, query: str) -> models.SparseVector:
+        """Embed a query into a sparse vector."""
+        pass
+
+    @abstractmethod
+    def get_vector_name(self) -> str:
+        """Get the name of the sparse vector for the Qdrant collection."""
+        pass
+
+    async def token_spans(self, text: str) -> list[tuple[int, int]]:
+        """
+        Split the text into tokens, as (start, end) character offsets. Used to chunk the entries
+        when there is no dense model. The default implementation splits words and punctuation.
+        """
+        return approximate_token_spans(text)
+
+    def get_modifier(self) -> models.Modifier | None:
+        """
+        Get the modifier Qdrant applies to the sparse vectors. Models weighting the terms by
+        their frequency in the collection, like BM25, need the IDF modifier.
+        """
+        return None
+
+
+class FastEmbedSparseProvider(SparseEmbeddingProvider):
+    """
+    FastEmbed implementation of the sparse embedding provider. The model is loaded on first use.
+    Inference runs on a dedicated thread, so it does not compete with the other blocking tasks
+    of the server.
+    :param model_name: The name of the FastEmbed sparse model to use, e.g. Qdrant/bm25.
+    :param threads: The number of ONNX intra-op threads of the model. If not provided, it gets half
+                    of the cores, as it runs next to the dense model in hybrid mode.
+    """
+
+    def __init__(self, model_name: str, threads: int | None = None):
+        from fastembed import SparseTextEmbedding
+
+        descriptions = {
+            description["model"].lower(): description
+            for description in SparseTextEmbedding.list_supported_models()
+        }
+        if model_name.lower() not in descriptions:
+            raise ValueError(
+                f"Unsupported FastEmbed sparse model: {model_name}, e.g. use Qdrant/bm25"
+            )
+        self.model_name = model_name
+        if threads is None:
+            # Avoid oversubscribing the cores with the ONNX threads of the dense model
+            threads = max(1, (os.cpu_count() or 1) // 2)
+        self.threads = threads
+        self._requires_idf = bool(descriptions[model_name.lower()]["requires_idf"])
+        self._model = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="fastembed-sparse"
+        )
+
+    async def embed_documents(self, documents: list[str]) -> list[models.SparseVector]:
+        """Embed a list of documents into sparse vectors."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._embed, documents, False)
+
+    async def embed_query(self, query: str) -> models.SparseVector:
+        """Embed a query into a sparse vector."""
+        loop = asyncio.get_running_loop()
+        return (await loop.run_in_executor(self._executor, self._embed, [query], True))[
+            0
+        ]
+
+    def get_vector_name(self) -> str:
+        """Get the name of the sparse vector for the Qdrant collection."""
+        model_name = self.model_name.split("/")[-1].lower()
+        return f"fast-sparse-{model_name}"
+
+    def get_modifier(self) -> models.Modifier | None:
+        """Get the modifier Qdrant applies to the sparse vectors."""
+        return models.Modifier.IDF if self._requires_idf else None
+
+    def _embed(self, texts: list[str], query: bool) -> list[models.SparseVector]:
+        model = self._get_model()
+        embeddings = model.query_embed(texts) if query else model.passage_embed(texts)
+        return [
+            models.SparseVector(
+                indices=embedding.indices.tolist(), values=embedding.values.tolist()
+            )
+            for embedding in embeddings
+        ]
+
+    def close(self) -> None:
+        """Shut down the executor running the inference."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                self._model = _load_model(self.model_name, self.threads)
+            return self._model
@@ -4,3 +4,5 @@ from enum import Enum
 class EmbeddingProviderType(Enum):
     FASTEMBED = "fastembed"
     OPENAI = "openai"
+    # Sparse vectors only, e.g. BM25, with no dense model loaded
+    FASTEMBED_SPARSE = "fastembed-sparse"
@@ -0,0 +1,311 @@
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Literal
+
+from mcp_server_qdrant.qdrant import Entry, QdrantConnector
+from mcp_server_qdrant.settings import METADATA_PATH
+
+logger = logging.getLogger(__name__)
+
+InputFormat = Literal["jsonl", "parquet", "text"]
+
+# The files read from a directory of text files
+TEXT_SUFFIXES = (".txt", ".md")
+
+
+def detect_format(path: Path) -> InputFormat:
+    """
+    Guess the format of the input from its path.
+    :param path: A JSONL or Parquet file, or a directory of text files.
+    """
+    if path.is_dir():
+        return "text"
+    if path.suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if path.suffix == ".parquet":
+        return "parquet"
+    raise ValueError(f"Cannot detect the format of {path}, please specify it")
+
+
+def read_entries(
+    path: Path, input_format: InputFormat, content_field: str = "content"
+) -> Iterator[Entry]:
+    """
+    Read the entries of the input lazily, in a stable order, so an ingest can be resumed.
+    A record of a JSONL or Parquet file holds the content in `content_field`. Its metadata is
+    the `metadata` field if present, and the other fields of the record otherwise.
+    :param path: The input file or directory.
+    :param input_format: The format of the input.
+    :param content_field: The field holding the text of a record.
+    """
+    if input_format == "jsonl":
+        records: Iterable[dict[str, Any]] = _read_jsonl(path)
+    elif input_format == "parquet":
+        records = _read_parquet(path)
+    elif input_format == "text":
+        return _read_text_files(path)
+    else:
+        raise ValueError(f"Unsupported input format: {input_format}")
+    return (_record_to_entry(record, content_field) for record in records)
+
+
+def _read_jsonl(path: Path) -> Iterator[dict[str, Any]]:
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _read_parquet(path: Path) -> Iterator[dict[str, Any]]:
+    try:
+        import pyarrow.parquet as pq  # type: ignore[import-not-found]
+    except ImportError:
+        raise ImportError(
+            "Reading Parquet files requires pyarrow. Install it with: pip install pyarrow"
+        )
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=1024):
+        yield from batch.to_pylist()
+
+
+def _read_text_files(path: Path) -> Iterator[Entry]:
+    files = sorted(
+        file
+        for file in path.rglob("*")
+        if file.suffix in TEXT_SUFFIXES and file.is_file()
+    )
+    for file in files:
+        yield Entry(
+            content=file.read_text(encoding="utf-8"),
+            metadata={"source": str(file.relative_to(path))},
+        )
+
+
+def _record_to_entry(record: dict[str, Any], content_field: str) -> Entry:
+    content = record.get(content_field)
+    if not isinstance(content, str):
+        raise ValueError(f"Record without a {content_field!r} text field: {record}")
+    if isinstance(record.get(METADATA_PATH), dict):
+        metadata = record[METADATA_PATH]
+    else:
+        metadata = {key: value for key, value in record.items() if key != content_field}
+    return Entry(content=content, metadata=metadata or None)
+
+
+class Checkpoint:
+    """
+    Persists which records of an input were stored, so an interrupted ingest continues where it stopped.
+    The batches complete out of order, so next to the number of records stored without a gap, the ranges
+    of the batches completed after a gap are kept and skipped on resume.
+    :param path: The path to the checkpoint file.
+    :param source: Identifies the input and the collection, a checkpoint is only valid for them.
+    """
+
+    def __init__(self, path: str | Path, source: str):
+        self.path = Path(path)
+        self.source = source
+
+    def load(self) -> int:
+        """
+        :return: The number of records stored without a gap, 0 if there is no checkpoint yet.
+        """
+        return self._load_state().get("records", 0)
+
+    def load_completed(self) -> list[tuple[int, int]]:
+        """
+        :return: The (start, end) record ranges of the batches stored after the first gap.
+        """
+        return [(start, end) for start, end in self._load_state().get("completed", [])]
+
+    def save(self, records: int, completed: Iterable[tuple[int, int]] = ()) -> None:
+        """
+        Store the number of records stored without a gap, and the ranges stored after it, atomically.
+        """
+        temporary_path = self.path.with_name(self.path.name + ".tmp")
+        temporary_path.write_text(
+            json.dumps(
+                {
+                    "source": self.source,
+                    "records": records,
+                    "completed": [list(batch_range) for batch_range in completed],
+                }
+            )
+        )
+        os.replace(temporary_path, self.path)
+
+    def _load_state(self) -> dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        state = json.loads(self.path.read_text())
+        if state.get("source") != self.source:
+            raise ValueError(
+                f"The checkpoint {self.path} belongs to another ingest: {state.get('source')}"
+            )
+        return state
+
+
+@dataclass
+class IngestStats:
+    """
+    The outcome of an ingest.
+    """
+
+    records: int = 0
+    resumed_from: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+
+async def ingest(
+    connector: QdrantConnector,
+    entries: Iterable[Entry],
+    *,
+    collection_name: str | None = None,
+    batch_size: int = 64,
+    workers: int = 2,
+    queue_size: int = 4,
+    checkpoint: Checkpoint | None = None,
+) -> IngestStats:
+    """
+    Store the entries in a collection with a pipeline of overlapping stages. A reader thread groups
+    the entries into batches and feeds them through a bounded queue. The workers embed and upsert them,
+    so at most `queue_size + workers` batches are held in memory. While one worker waits for the
+    embeddings of its batch, another one upserts.
+    :param connector: The connector used to store the entries, in the same layout the server reads.
+    :param entries: The entries to store, in a stable order if a checkpoint is used.
+    :param collection_name: The name of the collection, optional. If not provided, the default collection is used.
+    :param batch_size: The number of entries embedded and upserted together.
+    :param workers: The number of batches processed concurrently.
+    :param queue_size: The number of batches read ahead of the workers.
+    :param checkpoint: Where the progress is persisted, optional.
+    :return: The statistics of the ingest.
+    """
+    if batch_size <= 0 or workers <= 0 or queue_size <= 0:
+        raise ValueError("batch_size, workers and queue_size must be positive numbers")
+
+    start_time = time.perf_counter()
+    stats = IngestStats()
+    stats.resumed_from = checkpoint.load() if checkpoint is not None else 0
+    # The record ranges stored after the first gap, they are skipped and not stored twice
+    completed = checkpoint.load_completed() if checkpoint is not None else []
+    if stats.resumed_from or completed:
+        logger.info("Resuming the ingest after %d records", stats.resumed_from)
+    skipped = list(completed)
+    iterator = (
+        (offset, entry)
+        for offset, entry in itertools.islice(
+            enumerate(entries), stats.resumed_from, None
+        )
+        if not any(start <= offset < end for start, end in skipped)
+    )
+
+    queue: asyncio.Queue[tuple[int, int, list[Entry]] | None] = asyncio.Queue(
+        queue_size
+    )
+    committed = stats.resumed_from
+
+    async def read() -> None:
+        while True:
+            # Reading and parsing the input is blocking, so it runs in a thread
+            batch = await asyncio.to_thread(
+                lambda: list(itertools.islice(iterator, batch_size))
+            )
+            if not batch:
+                break
+            # The records skipped inside the range are stored already
+            await queue.put((batch[0][0], batch[-1][0] + 1, [e for _, e in batch]))
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def work() -> None:
+        nonlocal committed
+        while (item := await queue.get()) is not None:
+            start, end, batch = item
+            await connector.store_many(
+                batch, collection_name=collection_name, batch_size=batch_size
+            )
+            stats.records += len(batch)
+            stats.batches += 1
+            completed.append((start, end))
+            completed.sort()
+            # The batches complete out of order, the count only moves past the ranges without a gap
+            while completed and completed[0][0] <= committed:
+                committed = max(committed, completed.pop(0)[1])
+            if checkpoint is not None:
+                checkpoint.save(committed, completed)
+
+    # Created once up front, rather than by the first batch of every worker
+    await connector.ensure_collection(collection_name)
+    tasks = [asyncio.create_task(read())]
+    tasks.extend(asyncio.create_task(work()) for _ in range(workers))
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    stats.seconds = time.perf_counter() - start_time
+    return stats
+
+
+def main(args: argparse.Namespace) -> None:
+    """
+    Run the `ingest` command, configured by the same environment variables as the server.
+    :param args: The parsed command-line arguments of the `ingest` command.
+    """
+    from mcp_server_qdrant.common.connector import create_qdrant_connector
+    from mcp_server_qdrant.embeddings.factory import (
+        create_embedding_provider,
+        create_sparse_embedding_provider,
+    )
+    from mcp_server_qdrant.settings import EmbeddingProviderSettings, QdrantSettings
+
+    logging.basicConfig(level=logging.INFO)
+
+    qdrant_settings = QdrantSettings()
+    collection_name = args.collection_name or qdrant_settings.collection_name
+    if not collection_name:
+        raise SystemExit(
+            "A collection name is required, use --collection-name or COLLECTION_NAME"
+        )
+
+    path = Path(args.path)
+    input_format = args.format or detect_format(path)
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = Checkpoint(
+            args.checkpoint, source=f"{path.resolve()}:{collection_name}"
+        )
+
+    embedding_provider_settings = EmbeddingProviderSettings()
+    connector = create_qdrant_connector(
+        qdrant_settings,
+        create_embedding_provider(embedding_provider_settings),
+        create_sparse_embedding_provider(embedding_provider_settings),
+    )
+    stats = asyncio.run(
+        ingest(
+            connector,
+            read_entries(path, input_format, args.content_field),
+            collection_name=collection_name,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            queue_size=args.queue_size,
+            checkpoint=checkpoint,
+        )
+    )
+    print(
+        f"Stored {stats.records} records in {stats.batches} batches "
+        f"into {collection_name} in {stats.seconds:.1f}s"
+        + (f", after {stats.resumed_from} already stored" if stats.resumed_from else "")
+    )
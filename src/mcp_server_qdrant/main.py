@@ -15,8 +15,31 @@ def main():
         choices=["stdio", "sse", "streamable-http"],
         default="stdio",
     )
+    subparsers = parser.add_subparsers(dest="command")
+
+    # Bulk ingest, configured by the same environment variables as the server
+    ingest_parser = subparsers.add_parser(
+        "ingest",
+        help="Store the records of a JSONL or Parquet file, or a directory of text files",
+    )
+    ingest_parser.add_argument("path", help="The input file or directory")
+    ingest_parser.add_argument("--format", choices=["jsonl", "parquet", "text"])
+    ingest_parser.add_argument("--collection-name")
+    ingest_parser.add_argument("--content-field", default="content")
+    ingest_parser.add_argument("--batch-size", type=int, default=64)
+    ingest_parser.add_argument("--workers", type=int, default=2)
+    ingest_parser.add_argument("--queue-size", type=int, default=4)
+    ingest_parser.add_argument(
+        "--checkpoint", help="A file persisting the progress, to resume the ingest"
+    )
     args = parser.parse_args()
 
+    if args.command == "ingest":
+        from mcp_server_qdrant.ingest import main as ingest_main
+
+        ingest_main(args)
+        return
+
     # Import is done here to make sure environment variables are loaded
     # only after we make the changes.
     from mcp_server_qdrant.server import mcp
@@ -6,12 +6,17 @@ from fastmcp import Context, FastMCP
 from pydantic import Field
 from qdrant_client import models
 
-from mcp_server_qdrant.common.filters import make_indexes
+from mcp_server_qdrant.common.collection_config import make_search_params
+from mcp_server_qdrant.common.connector import create_qdrant_connector
 from mcp_server_qdrant.common.func_tools import make_partial_function
 from mcp_server_qdrant.common.wrap_filters import wrap_filters
 from mcp_server_qdrant.embeddings.base import EmbeddingProvider
-from mcp_server_qdrant.embeddings.factory import create_embedding_provider
-from mcp_server_qdrant.qdrant import ArbitraryFilter, Entry, Metadata, QdrantConnector
+from mcp_server_qdrant.embeddings.factory import (
+    create_embedding_provider,
+    create_sparse_embedding_provider,
+)
+from mcp_server_qdrant.embeddings.sparse import SparseEmbeddingProvider
+from mcp_server_qdrant.qdrant import ArbitraryFilter, Entry, Metadata
 from mcp_server_qdrant.settings import (
     EmbeddingProviderSettings,
     QdrantSettings,
@@ -34,6 +39,7 @@ class QdrantMCPServer(FastMCP):
         qdrant_settings: QdrantSettings,
         embedding_provider_settings: Optional[EmbeddingProviderSettings] = None,
         embedding_provider: Optional[EmbeddingProvider] = None,
+        sparse_embedding_provider: Optional[SparseEmbeddingProvider] = None,
         name: str = "mcp-server-qdrant",
         instructions: str | None = None,
         **settings: Any,
@@ -46,7 +52,16 @@ class QdrantMCPServer(FastMCP):
                 "Cannot provide both embedding_provider_settings and embedding_provider"
             )
 
-        if not embedding_provider_settings and not embedding_provider:
+        if embedding_provider_settings and sparse_embedding_provider:
+            raise ValueError(
+                "Cannot provide both embedding_provider_settings and sparse_embedding_provider"
+            )
+
+        if (
+            not embedding_provider_settings
+            and not embedding_provider
+            and not sparse_embedding_provider
+        ):
             raise ValueError(
                 "Must provide either embedding_provider_settings or embedding_provider"
             )
@@ -59,19 +74,21 @@ class QdrantMCPServer(FastMCP):
             self.embedding_provider = create_embedding_provider(
                 embedding_provider_settings
             )
+            sparse_embedding_provider = create_sparse_embedding_provider(
+                embedding_provider_settings
+            )
         else:
             self.embedding_provider_settings = None
             self.embedding_provider = embedding_provider
+        self.sparse_embedding_provider = sparse_embedding_provider
 
-        assert self.embedding_provider is not None, "Embedding provider is required"
+        assert (
+            self.embedding_provider is not None
+            or self.sparse_embedding_provider is not None
+        ), "Embedding provider is required"
 
-        self.qdrant_connector = QdrantConnector(
-            qdrant_settings.location,
-            qdrant_settings.api_key,
-            qdrant_settings.collection_name,
-            self.embedding_provider,
-            qdrant_settings.local_path,
-            make_indexes(qdrant_settings.filterable_fields_dict()),
+        self.qdrant_connector = create_qdrant_connector(
+            qdrant_settings, self.embedding_provider, self.sparse_embedding_provider
         )
 
         super().__init__(name=name, instructions=instructions, **settings)
@@ -124,6 +141,37 @@ class QdrantMCPServer(FastMCP):
                 return f"Remembered: {information} in collection {collection_name}"
             return f"Remembered: {information}"
 
+        async def store_batch(
+            ctx: Context,
+            entries: Annotated[
+                list[Entry],
+                Field(
+                    description="The information to store, each entry with its content and optional metadata"
+                ),
+            ],
+            collection_name: Annotated[
+                str, Field(description="The collection to store the information in")
+            ],
+        ) -> str:
+            """
+            Store several pieces of information in Qdrant at once.
+            :param ctx: The context for the request.
+            :param entries: The entries to store.
+            :param collection_name: The name of the collection to store the information in, optional. If not provided,
+                                    the default collection is used.
+            :return: A message indicating that the information was stored.
+            """
+            await ctx.debug(f"Storing {len(entries)} entries in Qdrant")
+
+            await self.qdrant_connector.store_many(
+                entries, collection_name=collection_name
+            )
+            if collection_name:
+                return (
+                    f"Remembered {len(entries)} entries in collection {collection_name}"
+                )
+            return f"Remembered {len(entries)} entries"
+
         async def find(
             ctx: Context,
             query: Annotated[str, Field(description="What to search for")],
@@ -131,6 +179,20 @@ class QdrantMCPServer(FastMCP):
                 str, Field(description="The collection to search in")
             ],
             query_filter: ArbitraryFilter | None = None,
+            hnsw_ef: Annotated[
+                int | None,
+                Field(
+                    description="Size of the search beam, higher values find better matches but are slower"
+                ),
+            ] = None,
+            exact: Annotated[
+                bool | None,
+                Field(description="Compare the query with every entry, slow but exact"),
+            ] = None,
+            score_threshold: Annotated[
+                float | None,
+                Field(description="Minimal similarity score of the returned entries"),
+            ] = None,
         ) -> list[str] | None:
             """
             Find memories in Qdrant.
@@ -139,6 +201,9 @@ class QdrantMCPServer(FastMCP):
             :param collection_name: The name of the collection to search in, optional. If not provided,
                                     the default collection is used.
             :param query_filter: The filter to apply to the query.
+            :param hnsw_ef: The size of the HNSW search beam, optional.
+            :param exact: Whether to run an exact search, without the HNSW index, optional.
+            :param score_threshold: The minimal score of the returned entries, optional.
             :return: A list of entries found or None.
             """
 
@@ -149,11 +214,19 @@ class QdrantMCPServer(FastMCP):
 
             await ctx.debug(f"Finding results for query {query}")
 
+            search_params = None
+            if hnsw_ef is not None or exact is not None:
+                search_params = make_search_params(
+                    self.qdrant_settings, hnsw_ef=hnsw_ef, exact=exact
+                )
+
             entries = await self.qdrant_connector.search(
                 query,
                 collection_name=collection_name,
                 limit=self.qdrant_settings.search_limit,
                 query_filter=query_filter,
+                search_params=search_params,
+                score_threshold=score_threshold,
             )
             if not entries:
                 return None
@@ -166,6 +239,12 @@ class QdrantMCPServer(FastMCP):
 
         find_foo = find
         store_foo = store
+        store_batch_foo = store_batch
+
+        if not self.qdrant_settings.allow_search_params:
+            find_foo = make_partial_function(
+                find_foo, {"hnsw_ef": None, "exact": None, "score_threshold": None}
+            )
 
         filterable_conditions = (
             self.qdrant_settings.filterable_fields_dict_with_conditions()
@@ -183,6 +262,10 @@ class QdrantMCPServer(FastMCP):
             store_foo = make_partial_function(
                 store_foo, {"collection_name": self.qdrant_settings.collection_name}
             )
+            store_batch_foo = make_partial_function(
+                store_batch_foo,
+                {"collection_name": self.qdrant_settings.collection_name},
+            )
 
         self.tool(
             find_foo,
@@ -197,3 +280,8 @@ class QdrantMCPServer(FastMCP):
                 name="qdrant-store",
                 description=self.tool_settings.tool_store_description,
             )
+            self.tool(
+                store_batch_foo,
+                name="qdrant-store-batch",
+                description=self.tool_settings.tool_store_batch_description,
+            )
@@ -1,11 +1,28 @@
+import asyncio
+import functools
+import hashlib
+import json
 import logging
 import uuid
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Literal
 
+import numpy as np
 from pydantic import BaseModel
 from qdrant_client import AsyncQdrantClient, models
+from qdrant_client.http.exceptions import UnexpectedResponse
 
+from mcp_server_qdrant.common.chunking import (
+    CHUNK_COUNT_KEY,
+    CHUNK_INDEX_KEY,
+    PARENT_ID_KEY,
+    make_chunks,
+)
+from mcp_server_qdrant.common.lru import CacheStats, LRUCache
+from mcp_server_qdrant.common.semantic_cache import SemanticCache
 from mcp_server_qdrant.embeddings.base import EmbeddingProvider
+from mcp_server_qdrant.embeddings.cached import normalize_query
+from mcp_server_qdrant.embeddings.sparse import SparseEmbeddingProvider
 from mcp_server_qdrant.settings import METADATA_PATH
 
 logger = logging.getLogger(__name__)
@@ -23,6 +40,68 @@ class Entry(BaseModel):
     metadata: Metadata | None = None
 
 
+@dataclass(frozen=True)
+class CollectionMetadata:
+    """
+    What the connector knows about a collection, cached to avoid a round trip on every call.
+    """
+
+    exists: bool
+    vectors: models.VectorsConfig | None = None
+    sparse_vectors: dict[str, models.SparseVectorParams] | None = None
+
+
+@dataclass(frozen=True)
+class DocumentEmbeddings:
+    """
+    The embeddings of a list of documents, with their sparse vectors if the collection has one.
+    """
+
+    dense: np.ndarray | None
+    sparse: list[models.SparseVector] | None = None
+
+
+# The namespace of the content-addressed point IDs
+POINT_ID_NAMESPACE = uuid.UUID("7c6b1e7e-3f3a-5b8e-9f0d-2a4c6e8b0d1f")
+
+
+def content_point_id(entry: Entry) -> str:
+    """
+    Compute the deterministic ID of an entry, derived from its content and metadata.
+    Storing the same entry twice gives the same ID, so it overwrites a single point.
+    """
+    digest = hashlib.sha256()
+    digest.update(entry.content.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(
+        json.dumps(entry.metadata, sort_keys=True, default=str).encode("utf-8")
+    )
+    return uuid.uuid5(POINT_ID_NAMESPACE, digest.hexdigest()).hex
+
+
+def _entries_size(entries: list[Entry]) -> int:
+    # An approximation of the memory held by the entries, used to bound the search cache
+    return sum(
+        len(entry.content) + len(json.dumps(entry.metadata, default=str))
+        for entry in entries
+    )
+
+
+def _is_not_found(error: Exception) -> bool:
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 404
+    # The local mode raises a ValueError for a missing collection
+    return isinstance(error, ValueError) and "not found" in str(error)
+
+
+def _is_conflict(error: Exception) -> bool:
+    if isinstance(error, UnexpectedResponse):
+        # Older Qdrant versions answer 400 instead of 409
+        return error.status_code == 409 or b"already exists" in error.content
+    # The local mode raises a ValueError for an existing collection
+    return isinstance(error, ValueError) and "already exists" in str(error)
+
+
 class QdrantConnector:
     """
     Encapsulates the connection to a Qdrant server and all the methods to interact with it.
@@ -30,8 +109,41 @@ class QdrantConnector:
     :param qdrant_api_key: The API key to use for the Qdrant server.
     :param collection_name: The name of the default collection to use. If not provided, each tool will require
                             the collection name to be provided.
-    :param embedding_provider: The embedding provider to use.
+    :param embedding_provider: The embedding provider to use. If None, the collections only have the sparse vector
+                               of the sparse embedding provider.
     :param qdrant_local_path: The path to the storage directory for the Qdrant client, if local mode is used.
+    :param field_indexes: The payload indexes created along with a new collection, optional.
+    :param quantization_config: The quantization of the vectors of a new collection, optional.
+    :param vectors_on_disk: Whether the original vectors of a new collection are stored on disk, optional.
+    :param search_params: The default search params of the queries, optional.
+    :param score_threshold: The default minimal score of the returned entries, optional.
+    :param hnsw_config: The HNSW index config of a new collection, optional.
+    :param optimizers_config: The optimizers config of a new collection, optional.
+    :param on_disk_payload: Whether the payload of a new collection is stored on disk, optional.
+    :param vector_datatype: The datatype of the vectors of a new collection, optional.
+    :param collection_cache_ttl: How long the metadata of an existing collection is cached, in seconds. 0 disables the cache.
+    :param store_batch_size: The default number of entries embedded and upserted together by `store_many`.
+    :param chunk_max_tokens: The maximum number of tokens of a stored point, optional. Longer entries are split
+                             into several points sharing a parent ID. If not provided, entries are never split.
+    :param chunk_overlap: The number of tokens shared by consecutive chunks of an entry.
+    :param deterministic_ids: Derive the point IDs from the content and the metadata of the entries, instead of
+                              random IDs. Entries which are already stored are neither embedded nor upserted again.
+    :param search_cache_size: The number of search results cached in memory, 0 disables the cache. The results of
+                              a collection are no longer served once the connector writes to it.
+    :param search_cache_max_bytes: The approximate memory limit of the search cache, in bytes. None means unbounded.
+    :param search_cache_ttl: The number of seconds cached search results stay valid, which bounds how long the
+                             writes of other clients go unnoticed. None means no expiration. It also applies to
+                             the semantic cache.
+    :param semantic_cache_size: The number of search results cached by the similarity of their query vectors,
+                                0 disables the semantic cache. Hybrid searches do not use it.
+    :param semantic_cache_threshold: The minimal cosine similarity of a query vector to a cached one for its results
+                                     to be reused.
+    :param single_flight: Run identical concurrent searches once, sharing the results between the callers.
+    :param sparse_embedding_provider: The sparse embedding provider, optional. If provided, the collections get a
+                                      sparse vector next to the dense one, and the searches are hybrid.
+    :param hybrid_fusion: How Qdrant fuses the dense and sparse results of a hybrid search.
+    :param hybrid_prefetch_limit: The number of candidates of each vector in a hybrid search. If not provided, four
+                                  times the limit of the search.
     """
 
     def __init__(
@@ -39,18 +151,84 @@ class QdrantConnector:
         qdrant_url: str | None,
         qdrant_api_key: str | None,
         collection_name: str | None,
-        embedding_provider: EmbeddingProvider,
+        embedding_provider: EmbeddingProvider | None,
         qdrant_local_path: str | None = None,
         field_indexes: dict[str, models.PayloadSchemaType] | None = None,
+        quantization_config: models.QuantizationConfig | None = None,
+        vectors_on_disk: bool | None = None,
+        search_params: models.SearchParams | None = None,
+        score_threshold: float | None = None,
+        hnsw_config: models.HnswConfigDiff | None = None,
+        optimizers_config: models.OptimizersConfigDiff | None = None,
+        on_disk_payload: bool | None = None,
+        vector_datatype: models.Datatype | None = None,
+        collection_cache_ttl: float = 60.0,
+        store_batch_size: int = 64,
+        chunk_max_tokens: int | None = None,
+        chunk_overlap: int = 0,
+        deterministic_ids: bool = False,
+        search_cache_size: int = 0,
+        search_cache_max_bytes: int | None = None,
+        search_cache_ttl: float | None = 60.0,
+        semantic_cache_size: int = 0,
+        semantic_cache_threshold: float = 0.95,
+        single_flight: bool = True,
+        sparse_embedding_provider: SparseEmbeddingProvider | None = None,
+        hybrid_fusion: Literal["rrf", "dbsf"] = "rrf",
+        hybrid_prefetch_limit: int | None = None,
     ):
+        if embedding_provider is None and sparse_embedding_provider is None:
+            raise ValueError("An embedding provider or a sparse one is required")
         self._qdrant_url = qdrant_url.rstrip("/") if qdrant_url else None
         self._qdrant_api_key = qdrant_api_key
         self._default_collection_name = collection_name
         self._embedding_provider = embedding_provider
+        self._sparse_embedding_provider = sparse_embedding_provider
+        self._hybrid_fusion = models.Fusion(hybrid_fusion)
+        self._hybrid_prefetch_limit = hybrid_prefetch_limit
         self._client = AsyncQdrantClient(
             location=qdrant_url, api_key=qdrant_api_key, path=qdrant_local_path
         )
         self._field_indexes = field_indexes
+        self._quantization_config = quantization_config
+        self._vectors_on_disk = vectors_on_disk
+        self._search_params = search_params
+        self._score_threshold = score_threshold
+        self._hnsw_config = hnsw_config
+        self._optimizers_config = optimizers_config
+        self._on_disk_payload = on_disk_payload
+        self._vector_datatype = vector_datatype
+        self._store_batch_size = store_batch_size
+        if chunk_max_tokens is not None and not 0 <= chunk_overlap < chunk_max_tokens:
+            raise ValueError("chunk_overlap must be between 0 and chunk_max_tokens - 1")
+        self._chunk_max_tokens = chunk_max_tokens
+        self._chunk_overlap = chunk_overlap
+        self._deterministic_ids = deterministic_ids
+        self._collections: LRUCache[str, CollectionMetadata] | None = None
+        if collection_cache_ttl > 0:
+            self._collections = LRUCache(max_entries=1024, ttl=collection_cache_ttl)
+        self._search_cache: LRUCache[tuple, list[Entry]] | None = None
+        if search_cache_size > 0:
+            self._search_cache = LRUCache(
+                max_entries=search_cache_size,
+                max_bytes=search_cache_max_bytes,
+                ttl=search_cache_ttl,
+                sizeof=_entries_size,
+            )
+        self._semantic_cache: SemanticCache[tuple, list[Entry]] | None = None
+        if semantic_cache_size > 0:
+            self._semantic_cache = SemanticCache(
+                max_entries=semantic_cache_size,
+                threshold=semantic_cache_threshold,
+                ttl=search_cache_ttl,
+            )
+        self._single_flight = single_flight
+        self._creation_locks: dict[str, asyncio.Lock] = {}
+        self._in_flight_searches: dict[tuple, asyncio.Task[list[Entry]]] = {}
+        # The number of callers still waiting for each in-flight search
+        self._search_waiters: dict[asyncio.Task[list[Entry]], int] = {}
+        # Bumped on every write to a collection, it is part of the search cache keys
+        self._collection_versions: dict[str, int] = {}
 
     async def get_collection_names(self) -> list[str]:
         """
@@ -60,6 +238,15 @@ class QdrantConnector:
         response = await self._client.get_collections()
         return [collection.name for collection in response.collections]
 
+    async def ensure_collection(self, collection_name: str | None = None) -> None:
+        """
+        Create the collection if it does not exist yet, in the layout `store` uses.
+        :param collection_name: The name of the collection, optional. If not provided, the default collection is used.
+        """
+        collection_name = collection_name or self._default_collection_name
+        assert collection_name is not None
+        await self._ensure_collection_exists(collection_name)
+
     async def store(self, entry: Entry, *, collection_name: str | None = None):
         """
         Store some information in the Qdrant collection, along with the specified metadata.
@@ -69,40 +256,318 @@ class QdrantConnector:
         """
         collection_name = collection_name or self._default_collection_name
         assert collection_name is not None
-        await self._ensure_collection_exists(collection_name)
+        collection = await self._ensure_collection_exists(collection_name)
+        # Long entries are stored as several chunks, embedded together
+        chunks = await self._split(entry)
+        collection, point_ids, chunks = await self._skip_existing(
+            collection_name,
+            collection,
+            [self._point_id(chunk) for chunk in chunks],
+            chunks,
+        )
+        if not chunks:
+            logger.debug("The entry is already stored in %s", collection_name)
+            return
 
         # Embed the document
         # ToDo: instead of embedding text explicitly, use `models.Document`,
         # it should unlock usage of server-side inference.
-        embeddings = await self._embedding_provider.embed_documents([entry.content])
+        embeddings = await self._embed_documents(
+            collection, [chunk.content for chunk in chunks]
+        )
 
         # Add to Qdrant
-        vector_name = self._embedding_provider.get_vector_name()
-        
+        await self._upsert(collection_name, collection, point_ids, chunks, embeddings)
+
+    async def store_many(
+        self,
+        entries: list[Entry],
+        *,
+        collection_name: str | None = None,
+        batch_size: int | None = None,
+    ):
+        """
+        Store several entries in the Qdrant collection. The entries are embedded and upserted in chunks,
+        and each chunk is embedded while the previous one is being upserted.
+        :param entries: The entries to store in the Qdrant collection.
+        :param collection_name: The name of the collection to store the information in, optional. If not provided,
+                                the default collection is used.
+        :param batch_size: The number of entries per chunk, optional. If not provided, the default one is used.
+        """
+        collection_name = collection_name or self._default_collection_name
+        assert collection_name is not None
+        batch_size = batch_size or self._store_batch_size
+        if not entries:
+            return
+        collection = await self._ensure_collection_exists(collection_name)
+        if self._chunk_max_tokens is not None:
+            split_entries = await asyncio.gather(*(self._split(e) for e in entries))
+            entries = [chunk for chunks in split_entries for chunk in chunks]
+        # Identical entries of the list are stored once
+        entries_by_id = {self._point_id(entry): entry for entry in entries}
+        all_ids = list(entries_by_id)
+
+        upsert: asyncio.Task | None = None
+        try:
+            for start in range(0, len(all_ids), batch_size):
+                collection, point_ids, chunk = await self._skip_existing(
+                    collection_name,
+                    collection,
+                    all_ids[start : start + batch_size],
+                    [
+                        entries_by_id[point_id]
+                        for point_id in all_ids[start : start + batch_size]
+                    ],
+                )
+                if not chunk:
+                    continue
+                embeddings = await self._embed_documents(
+                    collection, [entry.content for entry in chunk]
+                )
+                if upsert is not None:
+                    await upsert
+                upsert = asyncio.create_task(
+                    self._upsert(
+                        collection_name, collection, point_ids, chunk, embeddings
+                    )
+                )
+            if upsert is not None:
+                await upsert
+        finally:
+            if upsert is not None and not upsert.done():
+                upsert.cancel()
+
+    async def _embed_documents(
+        self, collection: CollectionMetadata, documents: list[str]
+    ) -> DocumentEmbeddings:
+        """
+        Embed the documents with the dense model, and with the sparse one if the collection has its vector.
+        Both models run concurrently.
+        """
+        if self._embedding_provider is None:
+            # Sparse vectors only
+            assert self._sparse_embedding_provider is not None
+            sparse = await self._sparse_embedding_provider.embed_documents(documents)
+            return DocumentEmbeddings(dense=None, sparse=sparse)
+        if self._resolve_sparse_vector_name(collection) is None:
+            dense = await self._embedding_provider.embed_documents_array(documents)
+            return DocumentEmbeddings(dense=dense)
+        assert self._sparse_embedding_provider is not None
+        dense, sparse = await asyncio.gather(
+            self._embedding_provider.embed_documents_array(documents),
+            self._sparse_embedding_provider.embed_documents(documents),
+        )
+        return DocumentEmbeddings(dense=dense, sparse=sparse)
+
+    async def _split(self, entry: Entry) -> list[Entry]:
+        """
+        Split an entry longer than the chunk size into chunks of the tokens of the embedding model.
+        Every chunk keeps the metadata of the entry, along with the ID of the entry and its position.
+        """
+        if self._chunk_max_tokens is None:
+            return [entry]
+        provider = self._embedding_provider or self._sparse_embedding_provider
+        assert provider is not None
+        spans = await provider.token_spans(entry.content)
+        if len(spans) <= self._chunk_max_tokens:
+            return [entry]
+
+        windows = make_chunks(spans, self._chunk_max_tokens, self._chunk_overlap)
+        parent_id = self._point_id(entry)
+        return [
+            Entry(
+                content=entry.content[start:end],
+                metadata={
+                    **(entry.metadata or {}),
+                    PARENT_ID_KEY: parent_id,
+                    CHUNK_INDEX_KEY: index,
+                    CHUNK_COUNT_KEY: len(windows),
+                },
+            )
+            for index, (start, end) in enumerate(windows)
+        ]
+
+    def _point_id(self, entry: Entry) -> str:
+        if self._deterministic_ids:
+            return content_point_id(entry)
+        return uuid.uuid4().hex
+
+    async def _skip_existing(
+        self,
+        collection_name: str,
+        collection: CollectionMetadata,
+        point_ids: list[str],
+        entries: list[Entry],
+    ) -> tuple[CollectionMetadata, list[str], list[Entry]]:
+        """
+        Leave out the entries whose point already exists. Only the content-addressed IDs can exist already,
+        so the lookup is skipped for random IDs. The collection is recreated if it was deleted meanwhile.
+        :return: The metadata of the collection, and the IDs and the entries which are not stored yet.
+        """
+        if not self._deterministic_ids or not point_ids:
+            return collection, point_ids, entries
+        try:
+            existing = await self._client.retrieve(
+                collection_name=collection_name,
+                ids=point_ids,
+                with_payload=False,
+                with_vectors=False,
+            )
+        except (UnexpectedResponse, ValueError) as e:
+            if not _is_not_found(e):
+                raise
+            # The collection was deleted since its metadata was cached, none of the entries is stored
+            self._invalidate_collection(collection_name)
+            collection = await self._ensure_collection_exists(collection_name)
+            return collection, point_ids, entries
+        # Qdrant returns the IDs in the canonical UUID format
+        existing_ids = {uuid.UUID(str(point.id)).hex for point in existing}
+        missing = [
+            (point_id, entry)
+            for point_id, entry in zip(point_ids, entries)
+            if point_id not in existing_ids
+        ]
+        return (
+            collection,
+            [point_id for point_id, _ in missing],
+            [entry for _, entry in missing],
+        )
+
+    async def _upsert(
+        self,
+        collection_name: str,
+        collection: CollectionMetadata,
+        point_ids: list[str],
+        entries: list[Entry],
+        embeddings: DocumentEmbeddings,
+    ):
+        """
+        Upsert the entries with their embeddings, recreating the collection if it was deleted meanwhile.
+        """
+        try:
+            await self._client.upsert(
+                collection_name=collection_name,
+                points=self._make_points(
+                    collection_name, collection, point_ids, entries, embeddings
+                ),
+            )
+        except (UnexpectedResponse, ValueError) as e:
+            if not _is_not_found(e):
+                raise
+            # The collection was deleted since its metadata was cached
+            self._invalidate_collection(collection_name)
+            collection = await self._ensure_collection_exists(collection_name)
+            await self._client.upsert(
+                collection_name=collection_name,
+                points=self._make_points(
+                    collection_name, collection, point_ids, entries, embeddings
+                ),
+            )
+        finally:
+            # Also after a failure, as some of the points may have been written
+            self._bump_version(collection_name)
+
+    def _make_points(
+        self,
+        collection_name: str,
+        collection: CollectionMetadata,
+        point_ids: list[str],
+        entries: list[Entry],
+        embeddings: DocumentEmbeddings,
+    ) -> list[models.PointStruct]:
+        """
+        Build the points of the entries, in the layout of the collection they are stored in.
+        """
+        vector_name = self._resolve_vector_name(collection_name, collection)
+        sparse_vector_name = self._resolve_sparse_vector_name(collection)
+        vectors: list[list[float] | None] = [None] * len(entries)
+        if embeddings.dense is not None:
+            # Converted at once, pydantic would otherwise validate the numpy floats one by one
+            vectors = embeddings.dense.tolist()
+        sparse_vectors: list[models.SparseVector | None] = [None] * len(entries)
+        if sparse_vector_name is not None and embeddings.sparse is not None:
+            sparse_vectors = list(embeddings.sparse)
+        return [
+            self._make_point(
+                vector_name, point_id, entry, vector, sparse_vector_name, sparse_vector
+            )
+            for point_id, entry, vector, sparse_vector in zip(
+                point_ids, entries, vectors, sparse_vectors, strict=True
+            )
+        ]
+
+    @staticmethod
+    def _make_point(
+        vector_name: str | None,
+        point_id: str,
+        entry: Entry,
+        vector: list[float] | None,
+        sparse_vector_name: str | None = None,
+        sparse_vector: models.SparseVector | None = None,
+    ) -> models.PointStruct:
+        has_sparse = sparse_vector_name is not None and sparse_vector is not None
         # Handle both named vectors and single vector collections
-        if vector_name:
-            # Named vector collection (new format)
-            vector_data = {vector_name: embeddings[0]}
+        vector_data: Any
+        if vector_name == "" and not has_sparse:
+            # Single vector collection (legacy compatibility)
+            vector_data = vector
+        else:
+            # Named vectors, the dense one is unnamed in a legacy collection and absent in sparse-only mode
+            vector_data = {}
+            if vector_name is not None:
+                vector_data[vector_name] = vector
+            if has_sparse:
+                vector_data[sparse_vector_name] = sparse_vector
+        if vector_name != "":
             payload = {"document": entry.content, METADATA_PATH: entry.metadata}
         else:
-            # Single vector collection (legacy compatibility)
-            vector_data = embeddings[0]
             # Use legacy format with 'text' field for compatibility
             payload = {"text": entry.content}
             if entry.metadata:
                 payload.update(entry.metadata)
-        
-        await self._client.upsert(
-            collection_name=collection_name,
-            points=[
-                models.PointStruct(
-                    id=uuid.uuid4().hex,
-                    vector=vector_data,
-                    payload=payload,
+
+        return models.PointStruct(id=point_id, vector=vector_data, payload=payload)
+
+    def _resolve_vector_name(
+        self, collection_name: str, collection: CollectionMetadata
+    ) -> str | None:
+        """
+        Find the vector of the collection holding the embeddings of the provider.
+        :return: The name of the vector, an empty string for a collection with a single unnamed vector,
+                 or None if the connector has no dense embedding provider.
+        """
+        if self._embedding_provider is None:
+            if self._resolve_sparse_vector_name(collection) is None:
+                assert self._sparse_embedding_provider is not None
+                raise ValueError(
+                    f"Collection {collection_name} has no sparse vector for the embedding model, "
+                    f"expected {self._sparse_embedding_provider.get_vector_name()!r}"
                 )
-            ],
+            return None
+        vectors = collection.vectors
+        if not isinstance(vectors, dict):
+            # Single unnamed vector (legacy layout)
+            return ""
+        vector_name = self._embedding_provider.get_vector_name()
+        if vector_name in vectors:
+            return vector_name
+        if "" in vectors:
+            return ""
+        raise ValueError(
+            f"Collection {collection_name} has no vector for the embedding model, "
+            f"expected {vector_name!r} but found {list(vectors)}"
         )
 
+    def _resolve_sparse_vector_name(self, collection: CollectionMetadata) -> str | None:
+        """
+        Find the sparse vector of the collection holding the embeddings of the sparse provider.
+        :return: The name of the sparse vector, or None if the collection or the connector has none.
+        """
+        if self._sparse_embedding_provider is None or not collection.sparse_vectors:
+            return None
+        vector_name = self._sparse_embedding_provider.get_vector_name()
+        return vector_name if vector_name in collection.sparse_vectors else None
+
     async def search(
         self,
         query: str,
@@ -110,6 +575,8 @@ class QdrantConnector:
         collection_name: str | None = None,
         limit: int = 10,
         query_filter: models.Filter | None = None,
+        search_params: models.SearchParams | None = None,
+        score_threshold: float | None = None,
     ) -> list[Entry]:
         """
         Find points in the Qdrant collection. If there are no entries found, an empty list is returned.
@@ -118,40 +585,179 @@ class QdrantConnector:
                                 the default collection is used.
         :param limit: The maximum number of entries to return.
         :param query_filter: The filter to apply to the query, if any.
+        :param search_params: The search params of the query. If not provided, the default ones are used.
+        :param score_threshold: The minimal score of the returned entries. If not provided, the default one
+                                is used.
 
         :return: A list of entries found.
         """
         collection_name = collection_name or self._default_collection_name
-        collection_exists = await self._client.collection_exists(collection_name)
-        if not collection_exists:
+        assert collection_name is not None
+        if search_params is None:
+            search_params = self._search_params
+        if score_threshold is None:
+            score_threshold = self._score_threshold
+
+        # The version is read before searching, so results racing with a write are cached under a stale key
+        context = self._search_context(
+            collection_name, limit, query_filter, search_params, score_threshold
+        )
+        cache_key = (context, normalize_query(query))
+        if self._search_cache is not None:
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                return [entry.model_copy(deep=True) for entry in cached]
+
+        search = functools.partial(
+            self._search,
+            query,
+            collection_name,
+            limit,
+            query_filter,
+            search_params,
+            score_threshold,
+            context,
+            cache_key,
+        )
+        if not self._single_flight:
+            return await search()
+
+        # Identical concurrent searches share a single task
+        task = self._in_flight_searches.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(search())
+            self._in_flight_searches[cache_key] = task
+            task.add_done_callback(
+                lambda _: self._in_flight_searches.pop(cache_key, None)
+            )
+        self._search_waiters[task] = self._search_waiters.get(task, 0) + 1
+        try:
+            # A cancelled caller must not cancel the search of the others
+            entries = await asyncio.shield(task)
+        finally:
+            self._search_waiters[task] -= 1
+            others = self._search_waiters[task]
+            if not others:
+                del self._search_waiters[task]
+        # The last caller to resume gets the results, the others copy them before it may change them
+        if not others:
+            return entries
+        return [entry.model_copy(deep=True) for entry in entries]
+
+    async def _search(
+        self,
+        query: str,
+        collection_name: str,
+        limit: int,
+        query_filter: models.Filter | None,
+        search_params: models.SearchParams | None,
+        score_threshold: float | None,
+        context: tuple,
+        cache_key: tuple,
+    ) -> list[Entry]:
+        """
+        Search in Qdrant, bypassing the search cache and the in-flight searches, and cache the results.
+        """
+        collection = await self._get_collection_metadata(collection_name)
+        if not collection.exists:
             return []
 
         # Embed the query
         # ToDo: instead of embedding text explicitly, use `models.Document`,
         # it should unlock usage of server-side inference.
 
-        query_vector = await self._embedding_provider.embed_query(query)
-        vector_name = self._embedding_provider.get_vector_name()
-
-        # Search in Qdrant
-        # Handle both named vectors and single vector collections
-        if vector_name:
-            # Named vector collection
-            search_results = await self._client.query_points(
-                collection_name=collection_name,
-                query=query_vector,
-                using=vector_name,
-                limit=limit,
-                query_filter=query_filter,
+        # The layout of the collection decides which vector is queried
+        vector_name = self._resolve_vector_name(collection_name, collection)
+        sparse_vector_name = self._resolve_sparse_vector_name(collection)
+        query_vector = None
+        sparse_query_vector = None
+        if self._embedding_provider is None:
+            assert self._sparse_embedding_provider is not None
+            sparse_query_vector = await self._sparse_embedding_provider.embed_query(
+                query
             )
+        elif sparse_vector_name is None:
+            query_vector = await self._embedding_provider.embed_query_array(query)
         else:
-            # Single vector collection (legacy compatibility)
-            search_results = await self._client.query_points(
-                collection_name=collection_name,
-                query=query_vector,
-                limit=limit,
-                query_filter=query_filter,
+            assert self._sparse_embedding_provider is not None
+            query_vector, sparse_query_vector = await asyncio.gather(
+                self._embedding_provider.embed_query_array(query),
+                self._sparse_embedding_provider.embed_query(query),
             )
+        # The semantic cache only compares the dense vectors, so hybrid searches, whose exact terms
+        # matter, never reuse the results of another query
+        semantic_cache = self._semantic_cache if sparse_query_vector is None else None
+        if semantic_cache is not None and query_vector is not None:
+            # A rephrased query with a close enough vector reuses the results
+            cached = semantic_cache.get(context, query_vector)
+            if cached is not None:
+                return [entry.model_copy(deep=True) for entry in cached]
+
+        # Search in Qdrant
+        try:
+            if query_vector is None:
+                # Sparse vectors only
+                search_results = await self._client.query_points(
+                    collection_name=collection_name,
+                    query=sparse_query_vector,
+                    using=sparse_vector_name,
+                    limit=limit,
+                    query_filter=query_filter,
+                    score_threshold=score_threshold,
+                )
+            elif sparse_query_vector is not None:
+                # Hybrid search, Qdrant fuses the candidates of the dense and the sparse vectors
+                prefetch_limit = self._hybrid_prefetch_limit or limit * 4
+                search_results = await self._client.query_points(
+                    collection_name=collection_name,
+                    prefetch=[
+                        models.Prefetch(
+                            query=query_vector.tolist(),
+                            using=vector_name or None,
+                            limit=prefetch_limit,
+                            filter=query_filter,
+                            params=search_params,
+                            score_threshold=score_threshold,
+                        ),
+                        models.Prefetch(
+                            query=sparse_query_vector,
+                            using=sparse_vector_name,
+                            limit=prefetch_limit,
+                            filter=query_filter,
+                        ),
+                    ],
+                    query=models.FusionQuery(fusion=self._hybrid_fusion),
+                    limit=limit,
+                    query_filter=query_filter,
+                )
+            # Handle both named vectors and single vector collections
+            elif vector_name:
+                # Named vector collection
+                search_results = await self._client.query_points(
+                    collection_name=collection_name,
+                    query=query_vector,
+                    using=vector_name,
+                    limit=limit,
+                    query_filter=query_filter,
+                    search_params=search_params,
+                    score_threshold=score_threshold,
+                )
+            else:
+                # Single vector collection (legacy compatibility)
+                search_results = await self._client.query_points(
+                    collection_name=collection_name,
+                    query=query_vector,
+                    limit=limit,
+                    query_filter=query_filter,
+                    search_params=search_params,
+                    score_threshold=score_threshold,
+                )
+        except (UnexpectedResponse, ValueError) as e:
+            if not _is_not_found(e):
+                raise
+            # The collection was deleted since its metadata was cached
+            self._invalidate_collection(collection_name)
+            return []
 
         entries = []
         for result in search_results.points:
@@ -164,40 +770,138 @@ class QdrantConnector:
                 # Legacy format (existing database format)
                 content = result.payload["text"]
                 # Extract metadata from other fields
-                metadata = {
-                    k: v for k, v in result.payload.items() 
-                    if k != "text"
-                }
+                metadata = {k: v for k, v in result.payload.items() if k != "text"}
             else:
                 # Fallback: use entire payload as content
                 content = str(result.payload)
                 metadata = None
-            
+
             entries.append(Entry(content=content, metadata=metadata))
-        
+
+        if self._search_cache is not None:
+            self._search_cache.put(
+                cache_key, [entry.model_copy(deep=True) for entry in entries]
+            )
+        if semantic_cache is not None and query_vector is not None:
+            semantic_cache.put(
+                context,
+                query_vector,
+                [entry.model_copy(deep=True) for entry in entries],
+            )
         return entries
 
-    async def _ensure_collection_exists(self, collection_name: str):
+    def search_cache_stats(self) -> CacheStats | None:
+        """
+        Get the hit, miss and eviction counters and the memory use of the search cache.
+        :return: The counters, or None if the search cache is disabled.
+        """
+        if self._search_cache is None:
+            return None
+        return self._search_cache.stats()
+
+    def semantic_cache_stats(self) -> CacheStats | None:
+        """
+        Get the hit, miss and eviction counters and the memory use of the semantic cache.
+        :return: The counters, or None if the semantic cache is disabled.
+        """
+        if self._semantic_cache is None:
+            return None
+        return self._semantic_cache.stats()
+
+    def _search_context(
+        self,
+        collection_name: str,
+        limit: int,
+        query_filter: models.Filter | None,
+        search_params: models.SearchParams | None,
+        score_threshold: float | None,
+    ) -> tuple:
+        """
+        Everything but the query which the cached results of a search depend on.
+        """
+        return (
+            collection_name,
+            self._collection_versions.get(collection_name, 0),
+            limit,
+            query_filter.model_dump_json(exclude_none=True) if query_filter else None,
+            search_params.model_dump_json(exclude_none=True) if search_params else None,
+            score_threshold,
+        )
+
+    def _bump_version(self, collection_name: str) -> None:
+        self._collection_versions[collection_name] = (
+            self._collection_versions.get(collection_name, 0) + 1
+        )
+        if self._semantic_cache is not None:
+            # Unlike the search cache, the rows of stale entries are freed right away
+            self._semantic_cache.invalidate(
+                lambda context: context[0] == collection_name
+            )
+
+    async def _ensure_collection_exists(
+        self, collection_name: str
+    ) -> CollectionMetadata:
         """
         Ensure that the collection exists, creating it if necessary.
         :param collection_name: The name of the collection to ensure exists.
+        :return: The metadata of the collection.
         """
-        collection_exists = await self._client.collection_exists(collection_name)
-        if not collection_exists:
-            # Create the collection with the appropriate vector size
-            vector_size = self._embedding_provider.get_vector_size()
+        collection = await self._get_collection_metadata(collection_name)
+        if collection.exists:
+            return collection
 
-            # Use the vector name as defined in the embedding provider
-            vector_name = self._embedding_provider.get_vector_name()
-            await self._client.create_collection(
-                collection_name=collection_name,
-                vectors_config={
-                    vector_name: models.VectorParams(
-                        size=vector_size,
-                        distance=models.Distance.COSINE,
+        # Concurrent stores into a new collection create it once
+        lock = self._creation_locks.setdefault(collection_name, asyncio.Lock())
+        waited = lock.locked()
+        async with lock:
+            if waited:
+                # Another store held the lock, it has probably created the collection
+                collection = await self._get_collection_metadata(collection_name)
+                if collection.exists:
+                    return collection
+
+            vectors_config: dict[str, models.VectorParams] = {}
+            if self._embedding_provider is not None:
+                # Create the collection with the appropriate vector size
+                vector_size = self._embedding_provider.get_vector_size()
+
+                # Use the vector name as defined in the embedding provider
+                vector_name = self._embedding_provider.get_vector_name()
+                vectors_config[vector_name] = models.VectorParams(
+                    size=vector_size,
+                    distance=models.Distance.COSINE,
+                    on_disk=self._vectors_on_disk,
+                    quantization_config=self._quantization_config,
+                    hnsw_config=self._hnsw_config,
+                    datatype=self._vector_datatype,
+                )
+            sparse_vectors_config = None
+            if self._sparse_embedding_provider is not None:
+                sparse_vectors_config = {
+                    self._sparse_embedding_provider.get_vector_name(): models.SparseVectorParams(
+                        modifier=self._sparse_embedding_provider.get_modifier()
                     )
-                },
+                }
+            try:
+                await self._client.create_collection(
+                    collection_name=collection_name,
+                    vectors_config=vectors_config,
+                    sparse_vectors_config=sparse_vectors_config,
+                    optimizers_config=self._optimizers_config,
+                    on_disk_payload=self._on_disk_payload,
+                )
+            except (UnexpectedResponse, ValueError) as e:
+                if not _is_conflict(e):
+                    raise
+                # Another client created the collection meanwhile, its layout is used as is
+                return await self._get_collection_metadata(collection_name)
+            collection = CollectionMetadata(
+                exists=True,
+                vectors=vectors_config,
+                sparse_vectors=sparse_vectors_config,
             )
+            if self._collections is not None:
+                self._collections.put(collection_name, collection)
 
             # Create payload indexes if configured
 
@@ -208,3 +912,38 @@ class QdrantConnector:
                         field_name=field_name,
                         field_schema=field_type,
                     )
+        return collection
+
+    async def _get_collection_metadata(
+        self, collection_name: str
+    ) -> CollectionMetadata:
+        """
+        Get the metadata of a collection, from the cache if possible.
+        :param collection_name: The name of the collection.
+        """
+        if self._collections is not None:
+            cached = self._collections.get(collection_name)
+            if cached is not None:
+                return cached
+
+        try:
+            info = await self._client.get_collection(collection_name)
+            metadata = CollectionMetadata(
+                exists=True,
+                vectors=info.config.params.vectors,
+                sparse_vectors=info.config.params.sparse_vectors,
+            )
+        except (UnexpectedResponse, ValueError) as e:
+            if not _is_not_found(e):
+                raise
+            # A missing collection is not cached, as another client may create it any time
+            return CollectionMetadata(exists=False)
+
+        if self._collections is not None:
+            self._collections.put(collection_name, metadata)
+        return metadata
+
+    def _invalidate_collection(self, collection_name: str) -> None:
+        self._bump_version(collection_name)
+        if self._collections is not None:
+            self._collections.invalidate(collection_name)
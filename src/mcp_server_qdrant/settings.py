@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings
@@ -8,6 +8,7 @@ from mcp_server_qdrant.embeddings.types import EmbeddingProviderType
 DEFAULT_TOOL_STORE_DESCRIPTION = (
     "Keep the memory for later use, when you are asked to remember something."
 )
+DEFAULT_TOOL_STORE_BATCH_DESCRIPTION = "Keep several memories for later use at once, when you are asked to remember many things."
 DEFAULT_TOOL_FIND_DESCRIPTION = (
     "Look up memories in Qdrant. Use this tool when you need to: \n"
     " - Find memories by their content \n"
@@ -17,6 +18,33 @@ DEFAULT_TOOL_FIND_DESCRIPTION = (
 
 METADATA_PATH = "metadata"
 
+# Presets of the collection parameters, applied to the settings which are not set explicitly
+COLLECTION_PROFILES: dict[str, dict[str, Any]] = {
+    "default": {},
+    # Everything in RAM and a denser HNSW graph, for the best search latency and recall
+    "latency": {
+        "hnsw_m": 32,
+        "hnsw_ef_construct": 256,
+        "vectors_on_disk": False,
+        "on_disk_payload": False,
+    },
+    # Half-precision vectors and the payload kept on disk, for the lowest RAM usage
+    "memory": {
+        "hnsw_m": 16,
+        "hnsw_on_disk": True,
+        "vectors_on_disk": True,
+        "on_disk_payload": True,
+        "vector_datatype": "float16",
+    },
+    # A cheaper HNSW graph, built on larger segments only, for the fastest bulk uploads
+    "ingest": {
+        "hnsw_m": 16,
+        "hnsw_ef_construct": 64,
+        "on_disk_payload": True,
+        "indexing_threshold": 50_000,
+    },
+}
+
 
 class ToolSettings(BaseSettings):
     """
@@ -27,6 +55,10 @@ class ToolSettings(BaseSettings):
         default=DEFAULT_TOOL_STORE_DESCRIPTION,
         validation_alias="TOOL_STORE_DESCRIPTION",
     )
+    tool_store_batch_description: str = Field(
+        default=DEFAULT_TOOL_STORE_BATCH_DESCRIPTION,
+        validation_alias="TOOL_STORE_BATCH_DESCRIPTION",
+    )
     tool_find_description: str = Field(
         default=DEFAULT_TOOL_FIND_DESCRIPTION,
         validation_alias="TOOL_FIND_DESCRIPTION",
@@ -46,6 +78,63 @@ class EmbeddingProviderSettings(BaseSettings):
         default="sentence-transformers/all-MiniLM-L6-v2",
         validation_alias="EMBEDDING_MODEL",
     )
+    sparse_model_name: str | None = Field(
+        default=None, validation_alias="EMBEDDING_SPARSE_MODEL"
+    )
+    query_cache_size: int = Field(
+        default=0, validation_alias="EMBEDDING_QUERY_CACHE_SIZE"
+    )
+    query_cache_max_bytes: int | None = Field(
+        default=None, validation_alias="EMBEDDING_QUERY_CACHE_MAX_BYTES"
+    )
+    query_cache_ttl: float | None = Field(
+        default=None, validation_alias="EMBEDDING_QUERY_CACHE_TTL"
+    )
+    document_cache_path: str | None = Field(
+        default=None, validation_alias="EMBEDDING_CACHE_PATH"
+    )
+    query_batch_window_ms: float = Field(
+        default=0, validation_alias="EMBEDDING_QUERY_BATCH_WINDOW_MS"
+    )
+    query_batch_max_size: int = Field(
+        default=32, validation_alias="EMBEDDING_QUERY_BATCH_MAX_SIZE"
+    )
+    max_batch_tokens: int = Field(
+        default=100_000, validation_alias="EMBEDDING_MAX_BATCH_TOKENS"
+    )
+    max_batch_size: int = Field(
+        default=2048, validation_alias="EMBEDDING_MAX_BATCH_SIZE"
+    )
+    max_concurrent_requests: int = Field(
+        default=4, validation_alias="EMBEDDING_MAX_CONCURRENT_REQUESTS"
+    )
+    max_retries: int = Field(default=5, validation_alias="EMBEDDING_MAX_RETRIES")
+    dimensions: int | None = Field(
+        default=None, validation_alias="EMBEDDING_DIMENSIONS"
+    )
+    threads: int | None = Field(default=None, validation_alias="EMBEDDING_THREADS")
+    executor: Literal["thread", "process"] = Field(
+        default="thread", validation_alias="EMBEDDING_EXECUTOR"
+    )
+    executor_workers: int = Field(
+        default=1, validation_alias="EMBEDDING_EXECUTOR_WORKERS"
+    )
+    bulk_parallel: int | None = Field(
+        default=None, validation_alias="EMBEDDING_BULK_PARALLEL"
+    )
+    bulk_batch_size: int = Field(
+        default=256, validation_alias="EMBEDDING_BULK_BATCH_SIZE"
+    )
+    bulk_threshold: int = Field(
+        default=512, validation_alias="EMBEDDING_BULK_THRESHOLD"
+    )
+    load_mode: Literal["eager", "background", "lazy"] = Field(
+        default="eager", validation_alias="EMBEDDING_LOAD_MODE"
+    )
+    warmup: bool = Field(default=False, validation_alias="EMBEDDING_WARMUP")
+    idle_timeout: float | None = Field(
+        default=None, validation_alias="EMBEDDING_IDLE_TIMEOUT"
+    )
 
 
 class FilterableField(BaseModel):
@@ -84,6 +173,43 @@ class QdrantSettings(BaseSettings):
     local_path: str | None = Field(default=None, validation_alias="QDRANT_LOCAL_PATH")
     search_limit: int = Field(default=10, validation_alias="QDRANT_SEARCH_LIMIT")
     read_only: bool = Field(default=False, validation_alias="QDRANT_READ_ONLY")
+    store_batch_size: int = Field(
+        default=64, validation_alias="QDRANT_STORE_BATCH_SIZE"
+    )
+    chunk_max_tokens: int | None = Field(
+        default=None, validation_alias="QDRANT_CHUNK_MAX_TOKENS"
+    )
+    chunk_overlap: int = Field(default=0, validation_alias="QDRANT_CHUNK_OVERLAP")
+    deterministic_ids: bool = Field(
+        default=False, validation_alias="QDRANT_DETERMINISTIC_IDS"
+    )
+    collection_cache_ttl: float = Field(
+        default=60.0, validation_alias="QDRANT_COLLECTION_CACHE_TTL"
+    )
+    search_cache_size: int = Field(
+        default=0, validation_alias="QDRANT_SEARCH_CACHE_SIZE"
+    )
+    search_cache_max_bytes: int | None = Field(
+        default=None, validation_alias="QDRANT_SEARCH_CACHE_MAX_BYTES"
+    )
+    search_cache_ttl: float | None = Field(
+        default=60.0, validation_alias="QDRANT_SEARCH_CACHE_TTL"
+    )
+    semantic_cache_size: int = Field(
+        default=0, validation_alias="QDRANT_SEMANTIC_CACHE_SIZE"
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.95, validation_alias="QDRANT_SEMANTIC_CACHE_THRESHOLD"
+    )
+    search_single_flight: bool = Field(
+        default=True, validation_alias="QDRANT_SEARCH_SINGLE_FLIGHT"
+    )
+    hybrid_fusion: Literal["rrf", "dbsf"] = Field(
+        default="rrf", validation_alias="QDRANT_HYBRID_FUSION"
+    )
+    hybrid_prefetch_limit: int | None = Field(
+        default=None, validation_alias="QDRANT_HYBRID_PREFETCH_LIMIT"
+    )
 
     filterable_fields: list[FilterableField] | None = Field(default=None)
 
@@ -91,6 +217,59 @@ class QdrantSettings(BaseSettings):
         default=False, validation_alias="QDRANT_ALLOW_ARBITRARY_FILTER"
     )
 
+    quantization: Literal["none", "scalar", "product", "binary"] = Field(
+        default="none", validation_alias="QDRANT_QUANTIZATION"
+    )
+    quantization_always_ram: bool = Field(
+        default=True, validation_alias="QDRANT_QUANTIZATION_ALWAYS_RAM"
+    )
+    scalar_quantile: float | None = Field(
+        default=None, validation_alias="QDRANT_SCALAR_QUANTILE"
+    )
+    product_quantization_ratio: Literal["x4", "x8", "x16", "x32", "x64"] = Field(
+        default="x16", validation_alias="QDRANT_PRODUCT_QUANTIZATION_RATIO"
+    )
+    vectors_on_disk: bool | None = Field(
+        default=None, validation_alias="QDRANT_VECTORS_ON_DISK"
+    )
+    search_rescore: bool = Field(default=True, validation_alias="QDRANT_SEARCH_RESCORE")
+    search_oversampling: float | None = Field(
+        default=None, validation_alias="QDRANT_SEARCH_OVERSAMPLING"
+    )
+    search_hnsw_ef: int | None = Field(
+        default=None, validation_alias="QDRANT_SEARCH_HNSW_EF"
+    )
+    search_exact: bool = Field(default=False, validation_alias="QDRANT_SEARCH_EXACT")
+    score_threshold: float | None = Field(
+        default=None, validation_alias="QDRANT_SCORE_THRESHOLD"
+    )
+    allow_search_params: bool = Field(
+        default=False, validation_alias="QDRANT_ALLOW_SEARCH_PARAMS"
+    )
+
+    collection_profile: Literal["default", "latency", "memory", "ingest"] = Field(
+        default="default", validation_alias="QDRANT_COLLECTION_PROFILE"
+    )
+    hnsw_m: int | None = Field(default=None, validation_alias="QDRANT_HNSW_M")
+    hnsw_ef_construct: int | None = Field(
+        default=None, validation_alias="QDRANT_HNSW_EF_CONSTRUCT"
+    )
+    hnsw_on_disk: bool | None = Field(
+        default=None, validation_alias="QDRANT_HNSW_ON_DISK"
+    )
+    on_disk_payload: bool | None = Field(
+        default=None, validation_alias="QDRANT_ON_DISK_PAYLOAD"
+    )
+    vector_datatype: Literal["float32", "float16", "uint8"] | None = Field(
+        default=None, validation_alias="QDRANT_VECTOR_DATATYPE"
+    )
+    indexing_threshold: int | None = Field(
+        default=None, validation_alias="QDRANT_INDEXING_THRESHOLD"
+    )
+    default_segment_number: int | None = Field(
+        default=None, validation_alias="QDRANT_DEFAULT_SEGMENT_NUMBER"
+    )
+
     def filterable_fields_dict(self) -> dict[str, FilterableField]:
         if self.filterable_fields is None:
             return {}
@@ -105,6 +284,13 @@ class QdrantSettings(BaseSettings):
             if field.condition is not None
         }
 
+    @model_validator(mode="after")
+    def apply_collection_profile(self) -> "QdrantSettings":
+        for name, value in COLLECTION_PROFILES[self.collection_profile].items():
+            if getattr(self, name) is None:
+                setattr(self, name, value)
+        return self
+
     @model_validator(mode="after")
     def check_local_path_conflict(self) -> "QdrantSettings":
         if self.local_path:
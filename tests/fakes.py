@@ -0,0 +1,83 @@
+import re
+import zlib
+
+import numpy as np
+from qdrant_client import models
+
+from mcp_server_qdrant.embeddings.base import EmbeddingProvider
+from mcp_server_qdrant.embeddings.sparse import SparseEmbeddingProvider
+
+
+class FakeEmbeddingProvider(EmbeddingProvider):
+    """
+    A deterministic bag-of-words embedding provider, which does not need to download any model.
+    Texts sharing words get similar vectors. It counts the calls, so tests can check what was embedded.
+    """
+
+    model_name = "fake-model"
+
+    def __init__(self, size: int = 64, vector_name: str = "fake-vector"):
+        self.size = size
+        self.vector_name = vector_name
+        self.document_calls: list[list[str]] = []
+        self.query_calls: list[list[str]] = []
+
+    def _embed(self, text: str) -> list[float]:
+        vector = np.zeros(self.size, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            vector[zlib.crc32(word.encode()) % self.size] += 1.0
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        else:
+            vector[0] = 1.0
+        return vector.tolist()
+
+    async def embed_documents(self, documents: list[str]) -> list[list[float]]:
+        self.document_calls.append(list(documents))
+        return [self._embed(document) for document in documents]
+
+    async def embed_query(self, query: str) -> list[float]:
+        return (await self.embed_queries([query]))[0]
+
+    async def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        self.query_calls.append(list(queries))
+        return [self._embed(query) for query in queries]
+
+    def get_vector_name(self) -> str:
+        return self.vector_name
+
+    def get_vector_size(self) -> int:
+        return self.size
+
+
+class FakeSparseEmbeddingProvider(SparseEmbeddingProvider):
+    """
+    A deterministic sparse provider counting the words of a text, which does not need to download any model.
+    """
+
+    def __init__(self, vector_name: str = "fake-sparse"):
+        self.vector_name = vector_name
+        self.document_calls: list[list[str]] = []
+        self.query_calls: list[str] = []
+
+    def _embed(self, text: str) -> models.SparseVector:
+        counts: dict[int, float] = {}
+        for word in re.findall(r"\w+", text.lower()):
+            index = zlib.crc32(word.encode())
+            counts[index] = counts.get(index, 0.0) + 1.0
+        return models.SparseVector(indices=list(counts), values=list(counts.values()))
+
+    async def embed_documents(self, documents: list[str]) -> list[models.SparseVector]:
+        self.document_calls.append(list(documents))
+        return [self._embed(document) for document in documents]
+
+    async def embed_query(self, query: str) -> models.SparseVector:
+        self.query_calls.append(query)
+        return self._embed(query)
+
+    def get_vector_name(self) -> str:
+        return self.vector_name
+
+    def get_modifier(self) -> models.Modifier | None:
+        return models.Modifier.IDF
@@ -0,0 +1,38 @@
+import pytest
+
+from mcp_server_qdrant.common.chunking import make_chunks
+
+
+def word_spans(text: str) -> list[tuple[int, int]]:
+    spans, start = [], 0
+    for word in text.split(" "):
+        spans.append((start, start + len(word)))
+        start += len(word) + 1
+    return spans
+
+
+class TestMakeChunks:
+    def test_windows_with_overlap(self):
+        text = "one two three four five six seven"
+
+        chunks = make_chunks(word_spans(text), max_tokens=3, overlap=1)
+
+        assert [text[start:end] for start, end in chunks] == [
+            "one two three",
+            "three four five",
+            "five six seven",
+        ]
+
+    def test_last_window_is_not_repeated(self):
+        text = "one two three four"
+
+        chunks = make_chunks(word_spans(text), max_tokens=2)
+
+        assert [text[start:end] for start, end in chunks] == ["one two", "three four"]
+
+    def test_short_text_is_a_single_window(self):
+        assert make_chunks(word_spans("one two"), max_tokens=8, overlap=4) == [(0, 7)]
+
+    def test_overlap_must_be_smaller_than_the_window(self):
+        with pytest.raises(ValueError):
+            make_chunks(word_spans("one two"), max_tokens=2, overlap=2)
@@ -0,0 +1,131 @@
+import pytest
+from qdrant_client import models
+
+from mcp_server_qdrant.common.collection_config import (
+    make_hnsw_config,
+    make_optimizers_config,
+    make_quantization_config,
+    make_search_params,
+    make_vector_datatype,
+)
+from mcp_server_qdrant.settings import QdrantSettings
+
+
+class TestQuantizationConfig:
+    def test_no_quantization_by_default(self):
+        settings = QdrantSettings()
+
+        assert make_quantization_config(settings) is None
+        assert make_search_params(settings) is None
+
+    def test_scalar_quantization(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_QUANTIZATION", "scalar")
+        monkeypatch.setenv("QDRANT_SCALAR_QUANTILE", "0.99")
+
+        config = make_quantization_config(QdrantSettings())
+
+        assert isinstance(config, models.ScalarQuantization)
+        assert config.scalar.type == models.ScalarType.INT8
+        assert config.scalar.quantile == 0.99
+        assert config.scalar.always_ram is True
+
+    def test_product_quantization(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_QUANTIZATION", "product")
+        monkeypatch.setenv("QDRANT_PRODUCT_QUANTIZATION_RATIO", "x32")
+        monkeypatch.setenv("QDRANT_QUANTIZATION_ALWAYS_RAM", "false")
+
+        config = make_quantization_config(QdrantSettings())
+
+        assert isinstance(config, models.ProductQuantization)
+        assert config.product.compression == models.CompressionRatio.X32
+        assert config.product.always_ram is False
+
+    def test_binary_quantization_search_params(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_QUANTIZATION", "binary")
+        monkeypatch.setenv("QDRANT_SEARCH_OVERSAMPLING", "3")
+
+        settings = QdrantSettings()
+        search_params = make_search_params(settings)
+
+        assert isinstance(make_quantization_config(settings), models.BinaryQuantization)
+        assert search_params is not None
+        assert search_params.quantization == models.QuantizationSearchParams(
+            rescore=True, oversampling=3.0
+        )
+
+    def test_unsupported_quantization(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_QUANTIZATION", "float8")
+
+        with pytest.raises(ValueError):
+            QdrantSettings()
+
+
+class TestCollectionProfiles:
+    def test_default_profile_keeps_server_defaults(self):
+        settings = QdrantSettings()
+
+        assert make_hnsw_config(settings) is None
+        assert make_optimizers_config(settings) is None
+        assert make_vector_datatype(settings) is None
+        assert settings.on_disk_payload is None
+
+    def test_memory_profile(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_COLLECTION_PROFILE", "memory")
+
+        settings = QdrantSettings()
+
+        assert settings.vectors_on_disk is True
+        assert settings.on_disk_payload is True
+        assert make_vector_datatype(settings) == models.Datatype.FLOAT16
+        assert make_hnsw_config(settings) == models.HnswConfigDiff(m=16, on_disk=True)
+
+    def test_explicit_settings_override_the_profile(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_COLLECTION_PROFILE", "latency")
+        monkeypatch.setenv("QDRANT_HNSW_M", "48")
+        monkeypatch.setenv("QDRANT_VECTORS_ON_DISK", "true")
+
+        settings = QdrantSettings()
+
+        assert make_hnsw_config(settings) == models.HnswConfigDiff(
+            m=48, ef_construct=256
+        )
+        assert settings.vectors_on_disk is True
+
+    def test_ingest_profile_optimizers(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_COLLECTION_PROFILE", "ingest")
+        monkeypatch.setenv("QDRANT_DEFAULT_SEGMENT_NUMBER", "4")
+
+        config = make_optimizers_config(QdrantSettings())
+
+        assert config == models.OptimizersConfigDiff(
+            indexing_threshold=50_000, default_segment_number=4
+        )
+
+    def test_unknown_profile(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_COLLECTION_PROFILE", "fastest")
+
+        with pytest.raises(ValueError):
+            QdrantSettings()
+
+
+class TestSearchParams:
+    def test_hnsw_ef_and_exact(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_SEARCH_HNSW_EF", "256")
+
+        settings = QdrantSettings()
+
+        assert make_search_params(settings) == models.SearchParams(hnsw_ef=256)
+        assert make_search_params(settings, hnsw_ef=32, exact=True) == (
+            models.SearchParams(hnsw_ef=32, exact=True)
+        )
+
+    def test_rescore_without_quantized_collections(self, monkeypatch):
+        # The collections may have been quantized outside the server
+        monkeypatch.setenv("QDRANT_SEARCH_RESCORE", "false")
+
+        search_params = make_search_params(QdrantSettings())
+
+        assert search_params is not None
+        assert search_params.quantization == models.QuantizationSearchParams(
+            rescore=False
+        )
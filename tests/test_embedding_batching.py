@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from mcp_server_qdrant.embeddings.batching import BatchingEmbeddingProvider
+from tests.fakes import FakeEmbeddingProvider
+
+
+class FailingProvider(FakeEmbeddingProvider):
+    async def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        raise RuntimeError("embedding failed")
+
+
+@pytest.mark.asyncio
+class TestBatchingEmbeddingProvider:
+    async def test_concurrent_queries_are_coalesced(self):
+        inner = FakeEmbeddingProvider()
+        provider = BatchingEmbeddingProvider(inner, window_ms=20, max_batch_size=32)
+
+        queries = ["first query", "second query", "first query", "third query"]
+        embeddings = await asyncio.gather(*(provider.embed_query(q) for q in queries))
+
+        assert inner.query_calls == [["first query", "second query", "third query"]]
+        for query, embedding in zip(queries, embeddings):
+            assert embedding == await inner.embed_query(query)
+
+    async def test_full_batch_is_sent_immediately(self):
+        inner = FakeEmbeddingProvider()
+        # The window is long enough to time out the test if it was waited for
+        provider = BatchingEmbeddingProvider(inner, window_ms=60_000, max_batch_size=2)
+
+        await asyncio.wait_for(
+            asyncio.gather(provider.embed_query("a"), provider.embed_query("b")),
+            timeout=5,
+        )
+
+        assert inner.query_calls == [["a", "b"]]
+
+    async def test_errors_are_propagated_to_every_caller(self):
+        provider = BatchingEmbeddingProvider(
+            FailingProvider(), window_ms=5, max_batch_size=32
+        )
+
+        results = await asyncio.gather(
+            provider.embed_query("a"),
+            provider.embed_query("b"),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,156 @@
+import threading
+
+import numpy as np
+import pytest
+
+from mcp_server_qdrant.common.lru import LRUCache
+from mcp_server_qdrant.embeddings.cached import CachedEmbeddingProvider
+from mcp_server_qdrant.embeddings.document_cache import DocumentEmbeddingCache
+from tests.fakes import FakeEmbeddingProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache: LRUCache[str, int] = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats().evictions == 1
+
+    def test_max_bytes(self):
+        cache: LRUCache[str, bytes] = LRUCache(max_entries=10, max_bytes=10, sizeof=len)
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.put("c", b"1")
+
+        assert "a" not in cache
+        assert cache.stats().size_bytes == 6
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache: LRUCache[str, int] = LRUCache(max_entries=10, ttl=5, clock=clock)
+        cache.put("a", 1)
+        clock.now = 4
+        assert cache.get("a") == 1
+        clock.now = 6
+        assert cache.get("a") is None
+
+        stats = cache.stats()
+        assert stats.expirations == 1
+        assert stats.hits == 1
+        assert stats.misses == 1
+
+
+@pytest.mark.asyncio
+class TestCachedEmbeddingProvider:
+    async def test_repeated_query_hits_cache(self):
+        inner = FakeEmbeddingProvider()
+        provider = CachedEmbeddingProvider(inner, max_entries=10)
+
+        first = await provider.embed_query("what is qdrant?")
+        second = await provider.embed_query("  what   is qdrant? ")
+
+        assert first == second
+        assert len(inner.query_calls) == 1
+        stats = provider.cache_stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+
+    async def test_eviction_counter(self):
+        inner = FakeEmbeddingProvider()
+        provider = CachedEmbeddingProvider(inner, max_entries=1)
+
+        await provider.embed_query("first")
+        await provider.embed_query("second")
+        await provider.embed_query("first")
+
+        assert len(inner.query_calls) == 3
+        assert provider.cache_stats().evictions == 2
+
+    async def test_delegates_collection_parameters(self):
+        inner = FakeEmbeddingProvider(size=8)
+        provider = CachedEmbeddingProvider(inner, max_entries=10)
+        assert provider.get_vector_name() == "fake-vector"
+        assert provider.get_vector_size() == 8
+        assert len((await provider.embed_documents(["abc"]))[0]) == 8
+
+    async def test_embed_queries_only_embeds_misses(self):
+        inner = FakeEmbeddingProvider()
+        provider = CachedEmbeddingProvider(inner, max_entries=10)
+
+        await provider.embed_query("cached")
+        embeddings = await provider.embed_queries(["cached", "fresh", "fresh"])
+
+        assert embeddings[1] == embeddings[2]
+        assert inner.query_calls == [["cached"], ["fresh"]]
+
+
+@pytest.mark.asyncio
+class TestDocumentEmbeddingCache:
+    async def test_only_missing_documents_are_embedded(self, tmp_path):
+        cache = DocumentEmbeddingCache(tmp_path / "embeddings.sqlite")
+        embedded: list[list[str]] = []
+
+        async def embed(documents: list[str]) -> np.ndarray:
+            embedded.append(documents)
+            return np.array(
+                [[len(document), 1.0] for document in documents], dtype=np.float32
+            )
+
+        first = await cache.get_or_embed("test/model", ["a", "bb", "a"], embed)
+        second = await cache.get_or_embed("test/model", ["bb", "ccc"], embed)
+
+        assert first.dtype == np.float32
+        assert first.tolist() == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+        assert second.tolist() == [[2.0, 1.0], [3.0, 1.0]]
+        assert embedded == [["a", "bb"], ["ccc"]]
+
+    async def test_survives_reopening(self, tmp_path):
+        path = tmp_path / "embeddings.sqlite"
+        cache = DocumentEmbeddingCache(path)
+        cache.put_many("test/model", ["hello"], [[0.25, 0.5]])
+        cache.close()
+
+        reopened = DocumentEmbeddingCache(path)
+        vectors = reopened.get_many("test/model", ["hello", "unknown"])
+        assert vectors[0].tolist() == [0.25, 0.5]
+        assert vectors[1] is None
+        # The namespace is part of the key
+        assert reopened.get_many("other/model", ["hello"]) == [None]
+
+    async def test_database_is_queried_off_the_event_loop(self, tmp_path, monkeypatch):
+        cache = DocumentEmbeddingCache(tmp_path / "embeddings.sqlite")
+        threads: list[threading.Thread] = []
+        get_many, put_many = cache.get_many, cache.put_many
+
+        def recording_get_many(*args):
+            threads.append(threading.current_thread())
+            return get_many(*args)
+
+        def recording_put_many(*args):
+            threads.append(threading.current_thread())
+            return put_many(*args)
+
+        monkeypatch.setattr(cache, "get_many", recording_get_many)
+        monkeypatch.setattr(cache, "put_many", recording_put_many)
+
+        async def embed(documents: list[str]) -> np.ndarray:
+            return np.ones((len(documents), 2), dtype=np.float32)
+
+        await cache.get_or_embed("test/model", ["a"], embed)
+
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
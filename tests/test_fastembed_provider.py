@@ -0,0 +1,327 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+
+import mcp_server_qdrant.embeddings.fastembed as fastembed_module
+import mcp_server_qdrant.embeddings.sparse as sparse_module
+from mcp_server_qdrant.embeddings.fastembed import FastEmbedProvider
+from mcp_server_qdrant.embeddings.sparse import FastEmbedSparseProvider
+
+
+def make_tokenizer() -> Tokenizer:
+    vocabulary = {"[UNK]": 0, "quick": 1, "brown": 2, "fox": 3}
+    tokenizer = Tokenizer(WordLevel(vocabulary, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    tokenizer.enable_truncation(max_length=2)
+    return tokenizer
+
+
+class FakeTextEmbedding:
+    """Stands in for the FastEmbed model, so the tests do not download it."""
+
+    def __init__(self, threads: int | None = None):
+        self.threads = threads
+        self.calls: list[tuple[str, list[str]]] = []
+        self.passage_kwargs: list[dict] = []
+        # The names of the threads running the inference
+        self.thread_names: list[str] = []
+        self.model = SimpleNamespace(tokenizer=make_tokenizer())
+
+    def passage_embed(self, documents, **kwargs):
+        self.calls.append(("passage", list(documents)))
+        self.passage_kwargs.append(kwargs)
+        self.thread_names.append(threading.current_thread().name)
+        for document in documents:
+            yield np.full(4, len(document), dtype=np.float32)
+
+    def query_embed(self, queries, **kwargs):
+        self.calls.append(("query", list(queries)))
+        self.thread_names.append(threading.current_thread().name)
+        for query in queries:
+            yield np.full(4, -len(query), dtype=np.float32)
+
+
+@pytest.fixture
+def loaded_models(monkeypatch) -> list[FakeTextEmbedding]:
+    models: list[FakeTextEmbedding] = []
+
+    def load_model(model_name, threads):
+        models.append(FakeTextEmbedding(threads))
+        return models[-1]
+
+    monkeypatch.setattr(fastembed_module, "_load_model", load_model)
+    return models
+
+
+class RecordingProcessPool:
+    """Records how the process pool is built, without spawning the worker processes."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+@pytest.mark.asyncio
+class TestFastEmbedProviderLifecycle:
+    async def test_warmup_runs_an_inference_at_startup(self, loaded_models):
+        provider = FastEmbedProvider("fake/model", warmup=True)
+
+        assert len(loaded_models) == 1
+        assert [kind for kind, _ in loaded_models[0].calls] == ["query", "passage"]
+        provider.close()
+
+    async def test_no_warmup_by_default(self, loaded_models):
+        provider = FastEmbedProvider("fake/model")
+
+        assert loaded_models[0].calls == []
+        provider.close()
+
+    async def test_idle_model_is_released_and_reloaded(self, loaded_models):
+        provider = FastEmbedProvider("fake/model", idle_timeout=3600)
+        await provider.embed_query("query")
+        assert not provider._unload_if_idle()
+
+        provider._last_used -= 3600
+        assert provider._unload_if_idle()
+        assert not provider.is_ready()
+
+        embedding = await provider.embed_query("query")
+        assert embedding == [-5.0] * 4
+        assert len(loaded_models) == 2
+        provider.close()
+
+    async def test_model_in_use_is_not_released(self, loaded_models):
+        provider = FastEmbedProvider("fake/model", idle_timeout=3600)
+        provider._acquire()
+        provider._last_used -= 3600
+
+        assert not provider._unload_if_idle()
+        assert provider.is_ready()
+        provider._release()
+        provider.close()
+
+    async def test_invalid_idle_timeout(self):
+        with pytest.raises(ValueError):
+            FastEmbedProvider("fake/model", load_mode="lazy", idle_timeout=0)
+
+    async def test_token_spans_are_not_truncated(self, loaded_models):
+        provider = FastEmbedProvider("fake/model")
+
+        spans = await provider.token_spans("The quick brown fox")
+
+        assert spans == [(0, 3), (4, 9), (10, 15), (16, 19)]
+        provider.close()
+
+
+@pytest.mark.asyncio
+class TestFastEmbedProviderExecutors:
+    async def test_inference_runs_on_a_dedicated_thread(self, loaded_models):
+        provider = FastEmbedProvider("fake/model")
+
+        await provider.embed_documents(["document"])
+        await provider.embed_query("query")
+
+        assert len(loaded_models[0].thread_names) == 2
+        assert all(
+            name.startswith("fastembed") for name in loaded_models[0].thread_names
+        )
+        provider.close()
+
+    async def test_threads_are_split_between_the_workers(
+        self, loaded_models, monkeypatch
+    ):
+        monkeypatch.setattr(fastembed_module.os, "cpu_count", lambda: 8)
+
+        provider = FastEmbedProvider("fake/model", workers=4)
+        assert provider.threads == 2
+        assert loaded_models[0].threads == 2
+        provider.close()
+
+        provider = FastEmbedProvider("fake/model", workers=4, threads=3)
+        assert provider.threads == 3
+        provider.close()
+
+        # A single worker leaves the choice to ONNX Runtime
+        provider = FastEmbedProvider("fake/model")
+        assert provider.threads is None
+        provider.close()
+
+    async def test_process_pool_spawns_workers_loading_the_model(self, monkeypatch):
+        monkeypatch.setattr(
+            fastembed_module, "ProcessPoolExecutor", RecordingProcessPool
+        )
+        monkeypatch.setattr(fastembed_module.os, "cpu_count", lambda: 8)
+
+        provider = FastEmbedProvider(
+            "fake/model", executor="process", workers=2, load_mode="lazy", warmup=True
+        )
+
+        kwargs = provider._executor.kwargs
+        assert kwargs["max_workers"] == 2
+        assert kwargs["mp_context"].get_start_method() == "spawn"
+        assert kwargs["initializer"] is fastembed_module._init_worker
+        assert kwargs["initargs"] == ("fake/model", 4, True)
+        provider.close()
+
+
+@pytest.mark.asyncio
+class TestFastEmbedProviderLoadModes:
+    async def test_lazy_model_is_loaded_on_first_use(self, loaded_models):
+        provider = FastEmbedProvider("fake/model", load_mode="lazy")
+        assert loaded_models == []
+        assert not provider.is_ready()
+
+        embedding = await provider.embed_query("query")
+
+        assert embedding == [-5.0] * 4
+        assert len(loaded_models) == 1
+        assert provider.is_ready()
+        provider.close()
+
+    async def test_background_model_is_loaded_by_a_thread(self, monkeypatch):
+        loaded = threading.Event()
+        release = threading.Event()
+
+        def load_model(model_name, threads):
+            # Blocks until the test lets the loading finish
+            release.wait(5)
+            loaded.set()
+            return FakeTextEmbedding()
+
+        monkeypatch.setattr(fastembed_module, "_load_model", load_model)
+        provider = FastEmbedProvider("fake/model", load_mode="background")
+        # The constructor returns before the model is loaded
+        assert not provider.is_ready()
+
+        query = asyncio.create_task(provider.embed_query("query"))
+        await asyncio.sleep(0.05)
+        assert not query.done()
+        release.set()
+
+        assert await query == [-5.0] * 4
+        assert loaded.is_set()
+        provider.close()
+
+    async def test_vector_size_without_loading_the_model(self, loaded_models):
+        provider = FastEmbedProvider(
+            "sentence-transformers/all-MiniLM-L6-v2", load_mode="lazy"
+        )
+
+        assert provider.get_vector_size() == 384
+        assert loaded_models == []
+        provider.close()
+
+
+@pytest.mark.asyncio
+class TestFastEmbedProviderBulk:
+    async def test_small_lists_do_not_use_the_bulk_mode(self, loaded_models):
+        provider = FastEmbedProvider(
+            "fake/model", bulk_parallel=2, bulk_batch_size=8, bulk_threshold=3
+        )
+
+        await provider.embed_documents_array(["a", "b"])
+
+        assert loaded_models[0].passage_kwargs == [
+            {"batch_size": 256, "parallel": None}
+        ]
+        assert provider._bulk_executor is None
+        provider.close()
+
+    async def test_large_lists_use_the_bulk_mode(self, loaded_models):
+        provider = FastEmbedProvider(
+            "fake/model", bulk_parallel=2, bulk_batch_size=8, bulk_threshold=3
+        )
+
+        embeddings = await provider.embed_documents_array(["a", "bb", "ccc"])
+
+        assert embeddings[:, 0].tolist() == [1.0, 2.0, 3.0]
+        assert loaded_models[0].passage_kwargs == [{"batch_size": 8, "parallel": 2}]
+        assert provider._bulk_executor is not None
+        provider.close()
+
+    async def test_bulk_mode_is_disabled_by_default(self, loaded_models):
+        provider = FastEmbedProvider("fake/model", bulk_threshold=1)
+
+        await provider.embed_documents_array(["a", "b"])
+
+        assert loaded_models[0].passage_kwargs == [
+            {"batch_size": 256, "parallel": None}
+        ]
+        provider.close()
+
+    async def test_process_pool_splits_and_concatenates_batches(self, monkeypatch):
+        provider = FastEmbedProvider(
+            "fake/model",
+            executor="process",
+            load_mode="lazy",
+            bulk_parallel=0,
+            bulk_batch_size=2,
+            bulk_threshold=3,
+        )
+        # The worker processes are replaced by threads sharing a fake worker model
+        provider._executor.shutdown()
+        provider._executor = ThreadPoolExecutor(max_workers=2)
+        model = FakeTextEmbedding()
+        monkeypatch.setattr(fastembed_module, "_worker_model", model)
+
+        documents = ["a", "bb", "ccc", "dddd", "eeeee"]
+        embeddings = await provider.embed_documents_array(documents)
+
+        assert embeddings[:, 0].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert sorted(batch for _, batch in model.calls) == [
+            ["a", "bb"],
+            ["ccc", "dddd"],
+            ["eeeee"],
+        ]
+        provider.close()
+
+
+class FakeSparseTextEmbedding:
+    """Stands in for the FastEmbed sparse model, recording the threads running it."""
+
+    def __init__(self):
+        self.threads: list[str] = []
+
+    def passage_embed(self, documents, **kwargs):
+        self.threads.append(threading.current_thread().name)
+        for document in documents:
+            yield SimpleNamespace(
+                indices=np.array([len(document)]), values=np.array([1.0])
+            )
+
+    def query_embed(self, queries, **kwargs):
+        return self.passage_embed(queries)
+
+
+@pytest.mark.asyncio
+class TestFastEmbedSparseProvider:
+    async def test_inference_runs_on_a_dedicated_thread(self, monkeypatch):
+        model = FakeSparseTextEmbedding()
+        loaded_threads = []
+
+        def load_model(model_name, threads):
+            loaded_threads.append(threads)
+            return model
+
+        monkeypatch.setattr(sparse_module, "_load_model", load_model)
+        monkeypatch.setattr(sparse_module.os, "cpu_count", lambda: 8)
+        provider = FastEmbedSparseProvider("Qdrant/bm25")
+
+        documents = await provider.embed_documents(["a", "bb"])
+        query = await provider.embed_query("ccc")
+
+        assert [vector.indices for vector in documents] == [[1], [2]]
+        assert query.indices == [3]
+        assert all(name.startswith("fastembed-sparse") for name in model.threads)
+        # The sparse model gets half of the cores, next to the dense one
+        assert loaded_threads == [4]
+        provider.close()
@@ -0,0 +1,214 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from mcp_server_qdrant.ingest import (
+    Checkpoint,
+    detect_format,
+    ingest,
+    read_entries,
+)
+from mcp_server_qdrant.qdrant import Entry, QdrantConnector
+from tests.fakes import FakeEmbeddingProvider
+
+
+@pytest.fixture
+def qdrant_connector():
+    return QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name=f"test_collection_{uuid.uuid4().hex}",
+        embedding_provider=FakeEmbeddingProvider(),
+    )
+
+
+class FailingConnector(QdrantConnector):
+    """Fails after storing a given number of batches, like an interrupted ingest."""
+
+    def __init__(self, *args, fail_after: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches_left = fail_after
+
+    async def store_many(self, entries, **kwargs):
+        if self.batches_left == 0:
+            raise ConnectionError("Qdrant is gone")
+        self.batches_left -= 1
+        await super().store_many(entries, **kwargs)
+
+
+class SlowFailingConnector(QdrantConnector):
+    """Fails on the batch holding a given record, after the other workers stored theirs."""
+
+    def __init__(self, *args, failing_content: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failing_content = failing_content
+
+    async def store_many(self, entries, **kwargs):
+        if any(entry.content == self.failing_content for entry in entries):
+            await asyncio.sleep(0.05)
+            raise ConnectionError("Qdrant is gone")
+        await super().store_many(entries, **kwargs)
+
+
+def write_jsonl(path, records):
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+
+
+class TestReadEntries:
+    def test_jsonl_records(self, tmp_path):
+        path = tmp_path / "records.jsonl"
+        write_jsonl(
+            path,
+            [
+                {"content": "first", "metadata": {"tag": "a"}},
+                {"content": "second", "author": "me"},
+                {"content": "third"},
+            ],
+        )
+
+        entries = list(read_entries(path, detect_format(path)))
+
+        assert entries == [
+            Entry(content="first", metadata={"tag": "a"}),
+            Entry(content="second", metadata={"author": "me"}),
+            Entry(content="third"),
+        ]
+
+    def test_text_directory(self, tmp_path):
+        (tmp_path / "notes").mkdir()
+        (tmp_path / "notes" / "b.md").write_text("Second note")
+        (tmp_path / "a.txt").write_text("First note")
+        (tmp_path / "image.png").write_bytes(b"\x89PNG")
+
+        entries = list(read_entries(tmp_path, detect_format(tmp_path)))
+
+        assert entries == [
+            Entry(content="First note", metadata={"source": "a.txt"}),
+            Entry(content="Second note", metadata={"source": "notes/b.md"}),
+        ]
+
+    def test_missing_content_field(self, tmp_path):
+        path = tmp_path / "records.jsonl"
+        write_jsonl(path, [{"text": "no content field"}])
+
+        with pytest.raises(ValueError, match="content"):
+            list(read_entries(path, "jsonl"))
+
+
+@pytest.mark.asyncio
+class TestIngest:
+    async def test_ingest_stores_every_record(self, qdrant_connector):
+        entries = [Entry(content=f"document {i}") for i in range(25)]
+
+        stats = await ingest(
+            qdrant_connector, entries, batch_size=4, workers=3, queue_size=2
+        )
+
+        assert stats.records == 25
+        assert stats.batches == 7
+        count = await qdrant_connector._client.count(
+            qdrant_connector._default_collection_name
+        )
+        assert count.count == 25
+
+    async def test_workers_do_not_race_on_creating_the_collection(
+        self, qdrant_connector, monkeypatch
+    ):
+        get_collection = qdrant_connector._client.get_collection
+
+        async def slow_get_collection(collection_name):
+            try:
+                return await get_collection(collection_name)
+            finally:
+                await asyncio.sleep(0.01)
+
+        monkeypatch.setattr(
+            qdrant_connector._client, "get_collection", slow_get_collection
+        )
+        entries = [Entry(content=f"document {i}") for i in range(8)]
+
+        stats = await ingest(qdrant_connector, entries, batch_size=2, workers=2)
+
+        assert stats.records == 8
+
+    async def test_resume_from_checkpoint(self, qdrant_connector, tmp_path):
+        entries = [Entry(content=f"document {i}") for i in range(10)]
+        checkpoint = Checkpoint(tmp_path / "checkpoint.json", source="test")
+        collection_name = qdrant_connector._default_collection_name
+        failing_connector = FailingConnector(
+            ":memory:",
+            None,
+            collection_name,
+            FakeEmbeddingProvider(),
+            fail_after=2,
+        )
+        # Both connectors share the in-memory database
+        failing_connector._client = qdrant_connector._client
+
+        with pytest.raises(ConnectionError):
+            await ingest(
+                failing_connector,
+                entries,
+                batch_size=3,
+                workers=1,
+                checkpoint=checkpoint,
+            )
+        assert checkpoint.load() == 6
+
+        stats = await ingest(
+            qdrant_connector, entries, batch_size=3, workers=1, checkpoint=checkpoint
+        )
+
+        assert stats.resumed_from == 6
+        assert stats.records == 4
+        count = await qdrant_connector._client.count(collection_name)
+        assert count.count == 10
+
+    async def test_resume_skips_batches_completed_after_a_failure(
+        self, qdrant_connector, tmp_path
+    ):
+        entries = [Entry(content=f"document {i}") for i in range(6)]
+        checkpoint = Checkpoint(tmp_path / "checkpoint.json", source="test")
+        collection_name = qdrant_connector._default_collection_name
+        failing_connector = SlowFailingConnector(
+            ":memory:",
+            None,
+            collection_name,
+            FakeEmbeddingProvider(),
+            failing_content="document 0",
+        )
+        failing_connector._client = qdrant_connector._client
+
+        with pytest.raises(ConnectionError):
+            await ingest(
+                failing_connector,
+                entries,
+                batch_size=3,
+                workers=2,
+                checkpoint=checkpoint,
+            )
+        # The second batch was stored before the first one failed
+        assert checkpoint.load() == 0
+        assert checkpoint.load_completed() == [(3, 6)]
+
+        stats = await ingest(
+            qdrant_connector, entries, batch_size=3, workers=2, checkpoint=checkpoint
+        )
+
+        assert stats.records == 3
+        assert checkpoint.load() == 6
+        assert checkpoint.load_completed() == []
+        count = await qdrant_connector._client.count(collection_name)
+        assert count.count == 6
+
+    async def test_checkpoint_of_another_ingest(self, qdrant_connector, tmp_path):
+        Checkpoint(tmp_path / "checkpoint.json", source="other").save(3)
+
+        with pytest.raises(ValueError, match="another ingest"):
+            await ingest(
+                qdrant_connector,
+                [Entry(content="document")],
+                checkpoint=Checkpoint(tmp_path / "checkpoint.json", source="test"),
+            )
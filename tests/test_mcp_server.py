@@ -0,0 +1,76 @@
+import pytest
+from fastmcp import Client
+
+from mcp_server_qdrant.mcp_server import QdrantMCPServer
+from mcp_server_qdrant.qdrant import Entry
+from mcp_server_qdrant.settings import FilterableField, QdrantSettings, ToolSettings
+from tests.fakes import FakeEmbeddingProvider
+
+
+async def find_tool_parameters(server: QdrantMCPServer) -> dict:
+    tools = await server.get_tools()
+    return tools["qdrant-find"].parameters
+
+
+@pytest.fixture
+def qdrant_settings(monkeypatch) -> QdrantSettings:
+    monkeypatch.setenv("QDRANT_URL", ":memory:")
+    return QdrantSettings()
+
+
+@pytest.mark.asyncio
+class TestFindTool:
+    async def test_search_params_are_hidden_by_default(self, qdrant_settings):
+        server = QdrantMCPServer(
+            ToolSettings(), qdrant_settings, embedding_provider=FakeEmbeddingProvider()
+        )
+
+        parameters = await find_tool_parameters(server)
+
+        assert set(parameters["properties"]) == {"query", "collection_name"}
+
+    async def test_search_params_are_exposed(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_URL", ":memory:")
+        monkeypatch.setenv("QDRANT_ALLOW_SEARCH_PARAMS", "true")
+        settings = QdrantSettings(
+            filterable_fields=[
+                FilterableField(
+                    name="color",
+                    description="The color",
+                    field_type="keyword",
+                    condition="==",
+                    required=True,
+                )
+            ]
+        )
+        server = QdrantMCPServer(
+            ToolSettings(), settings, embedding_provider=FakeEmbeddingProvider()
+        )
+
+        parameters = await find_tool_parameters(server)
+
+        assert {"hnsw_ef", "exact", "score_threshold"} <= set(parameters["properties"])
+        assert parameters["required"] == ["query", "collection_name", "color"]
+
+
+@pytest.mark.asyncio
+async def test_store_batch_tool(qdrant_settings):
+    server = QdrantMCPServer(
+        ToolSettings(), qdrant_settings, embedding_provider=FakeEmbeddingProvider()
+    )
+
+    async with Client(server) as client:
+        result = await client.call_tool(
+            "qdrant-store-batch",
+            {
+                "entries": [
+                    {"content": "The quick brown fox"},
+                    {"content": "The lazy dog", "metadata": {"animal": "dog"}},
+                ],
+                "collection_name": "memories",
+            },
+        )
+
+    assert result[0].text == "Remembered 2 entries in collection memories"
+    entries = await server.qdrant_connector.search("dog", collection_name="memories")
+    assert Entry(content="The lazy dog", metadata={"animal": "dog"}) in entries
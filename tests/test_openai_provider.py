@@ -0,0 +1,137 @@
+import base64
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import openai
+import pytest
+
+from mcp_server_qdrant.embeddings.openai import OpenAIProvider
+
+
+class FakeEmbeddingsAPI:
+    """Records the requests and embeds every input as [len(input), index in request]."""
+
+    def __init__(self, rate_limited_calls: int = 0):
+        self.requests: list[list[str]] = []
+        self.dimensions: list[object] = []
+        self.rate_limited_calls = rate_limited_calls
+
+    async def create(self, input: list[str], model: str, **kwargs):
+        if self.rate_limited_calls > 0:
+            self.rate_limited_calls -= 1
+            request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+            response = httpx.Response(
+                429, headers={"retry-after": "0.01"}, request=request
+            )
+            raise openai.RateLimitError("rate limited", response=response, body=None)
+        self.requests.append(list(input))
+        self.dimensions.append(kwargs.get("dimensions"))
+        data = [
+            SimpleNamespace(index=i, embedding=[float(len(text)), float(i)])
+            for i, text in enumerate(input)
+        ]
+        if kwargs.get("encoding_format") == "base64":
+            for item in data:
+                raw = np.array(item.embedding, dtype=np.float32).tobytes()
+                item.embedding = base64.b64encode(raw).decode()
+        # The API does not guarantee the order of the items
+        return SimpleNamespace(data=data[::-1])
+
+
+@pytest.fixture
+def provider():
+    provider = OpenAIProvider(
+        "text-embedding-3-small",
+        api_key="test-key",
+        max_batch_tokens=30,
+        max_concurrent_requests=2,
+    )
+    provider.client = SimpleNamespace(embeddings=FakeEmbeddingsAPI())
+    # Use the approximate token counts, even if tiktoken is installed
+    provider._encoding = None
+    return provider
+
+
+@pytest.mark.asyncio
+class TestOpenAIProvider:
+    async def test_batches_respect_token_budget(self, provider):
+        # A 12 characters text is estimated as 12 tokens, one per byte
+        documents = [f"document {i:03d}" for i in range(5)]
+
+        embeddings = await provider.embed_documents(documents)
+
+        requests = provider.client.embeddings.requests
+        assert sorted(len(request) for request in requests) == [1, 2, 2]
+        # The results are returned in the original order
+        assert [embedding[0] for embedding in embeddings] == [12.0] * 5
+        flattened = [text for request in requests for text in request]
+        assert sorted(flattened) == documents
+
+    async def test_order_is_preserved(self, provider):
+        documents = ["a" * 20, "b", "c" * 25, "d"]
+
+        embeddings = await provider.embed_documents(documents)
+
+        assert [embedding[0] for embedding in embeddings] == [20.0, 1.0, 25.0, 1.0]
+
+    async def test_approximate_count_does_not_undercount(self, provider):
+        # CJK text takes about one token per character, code even more
+        assert provider.count_tokens("検索拡張生成") == 18
+        assert provider.count_tokens("x=f(y);") == 7
+        documents = ["検索拡張生成", "検索拡張", "生成"]
+
+        await provider.embed_documents(documents)
+
+        requests = provider.client.embeddings.requests
+        assert sorted(len(request) for request in requests) == [1, 2]
+
+    async def test_base64_embeddings_are_decoded(self, provider):
+        embeddings = await provider.embed_queries(["one", "three"])
+
+        assert embeddings == [[3.0, 0.0], [5.0, 1.0]]
+        assert all(isinstance(value, float) for value in embeddings[0])
+
+    async def test_rate_limit_is_retried(self, provider):
+        provider.client.embeddings.rate_limited_calls = 2
+
+        embedding = await provider.embed_query("query")
+
+        assert embedding == [5.0, 0.0]
+        assert provider.client.embeddings.requests == [["query"]]
+
+    async def test_gives_up_after_max_retries(self, provider):
+        provider.max_retries = 1
+        provider.client.embeddings.rate_limited_calls = 5
+
+        with pytest.raises(openai.RateLimitError):
+            await provider.embed_query("query")
+
+    async def test_full_dimensions_by_default(self, provider):
+        await provider.embed_query("query")
+
+        assert provider.get_vector_size() == 1536
+        assert provider.client.embeddings.dimensions == [openai.NOT_GIVEN]
+
+
+class TestOpenAIDimensions:
+    @pytest.mark.asyncio
+    async def test_dimensions_are_requested(self):
+        provider = OpenAIProvider(
+            "text-embedding-3-large", api_key="test-key", dimensions=256
+        )
+        provider.client = SimpleNamespace(embeddings=FakeEmbeddingsAPI())
+
+        assert provider.get_vector_size() == 256
+        await provider.embed_documents(["document"])
+        assert provider.client.embeddings.dimensions == [256]
+
+    def test_unsupported_model(self):
+        with pytest.raises(ValueError, match="does not support"):
+            OpenAIProvider("text-embedding-ada-002", api_key="test-key", dimensions=256)
+
+    def test_dimensions_out_of_range(self):
+        with pytest.raises(ValueError, match="between 1 and 1536"):
+            OpenAIProvider(
+                "text-embedding-3-small", api_key="test-key", dimensions=2048
+            )
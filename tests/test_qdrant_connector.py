@@ -0,0 +1,639 @@
+import asyncio
+import uuid
+
+import numpy as np
+import pytest
+from qdrant_client import models
+
+from mcp_server_qdrant.qdrant import Entry, QdrantConnector
+from tests.fakes import FakeEmbeddingProvider, FakeSparseEmbeddingProvider
+
+
+@pytest.fixture
+def embedding_provider():
+    """Fixture to provide an embedding provider which does not need a model download."""
+    return FakeEmbeddingProvider()
+
+
+@pytest.fixture
+async def qdrant_connector(embedding_provider):
+    """Fixture to provide a QdrantConnector with in-memory Qdrant client."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name=f"test_collection_{uuid.uuid4().hex}",
+        embedding_provider=embedding_provider,
+    )
+    yield connector
+
+
+@pytest.mark.asyncio
+async def test_array_embeddings_round_trip(qdrant_connector, embedding_provider):
+    """Test that the float32 arrays produced by the provider are stored and searched as-is."""
+    query_vector = await embedding_provider.embed_query_array("fox")
+    assert isinstance(query_vector, np.ndarray)
+    assert query_vector.dtype == np.float32
+
+    await qdrant_connector.store(Entry(content="The quick brown fox"))
+    await qdrant_connector.store(Entry(content="Lorem ipsum dolor sit amet"))
+
+    results = await qdrant_connector.search("brown fox", limit=1)
+
+    assert [result.content for result in results] == ["The quick brown fox"]
+
+
+@pytest.mark.asyncio
+async def test_points_get_plain_float_vectors(qdrant_connector, monkeypatch):
+    """Test that the float32 matrix is converted to lists once, not validated float by float."""
+    vectors = []
+    make_point = QdrantConnector._make_point
+
+    def recording_make_point(vector_name, point_id, entry, vector, *args):
+        vectors.append(vector)
+        return make_point(vector_name, point_id, entry, vector, *args)
+
+    monkeypatch.setattr(
+        QdrantConnector, "_make_point", staticmethod(recording_make_point)
+    )
+
+    await qdrant_connector.store_many(
+        [Entry(content="The quick brown fox"), Entry(content="The lazy dog")]
+    )
+
+    assert len(vectors) == 2
+    assert all(type(vector) is list for vector in vectors)
+    assert all(type(value) is float for vector in vectors for value in vector)
+
+
+@pytest.mark.asyncio
+async def test_collection_config(embedding_provider):
+    """Test that new collections are created with the configured parameters."""
+    quantization_config = models.ScalarQuantization(
+        scalar=models.ScalarQuantizationConfig(
+            type=models.ScalarType.INT8, always_ram=True
+        )
+    )
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name="quantized",
+        embedding_provider=embedding_provider,
+        quantization_config=quantization_config,
+        vectors_on_disk=True,
+        search_params=models.SearchParams(
+            quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+        ),
+        hnsw_config=models.HnswConfigDiff(m=32, ef_construct=256),
+        vector_datatype=models.Datatype.FLOAT16,
+        on_disk_payload=True,
+    )
+
+    await connector.store(Entry(content="The quick brown fox"))
+    results = await connector.search("brown fox")
+
+    assert [result.content for result in results] == ["The quick brown fox"]
+    collection = await connector._client.get_collection("quantized")
+    vector_params = collection.config.params.vectors[
+        embedding_provider.get_vector_name()
+    ]
+    assert vector_params.on_disk is True
+    assert vector_params.quantization_config == quantization_config
+    assert vector_params.hnsw_config == models.HnswConfigDiff(m=32, ef_construct=256)
+    assert vector_params.datatype == models.Datatype.FLOAT16
+
+
+@pytest.mark.asyncio
+async def test_score_threshold(qdrant_connector):
+    """Test that the entries scoring below the threshold are not returned."""
+    await qdrant_connector.store(Entry(content="The quick brown fox"))
+    await qdrant_connector.store(Entry(content="Lorem ipsum dolor sit amet"))
+
+    results = await qdrant_connector.search("quick brown fox", score_threshold=0.5)
+    exact_results = await qdrant_connector.search(
+        "quick brown fox", search_params=models.SearchParams(exact=True)
+    )
+
+    assert [result.content for result in results] == ["The quick brown fox"]
+    assert len(exact_results) == 2
+
+
+@pytest.mark.asyncio
+async def test_collection_metadata_is_cached(qdrant_connector, monkeypatch):
+    """Test that the collection metadata is fetched once, not on every call."""
+    calls = []
+    get_collection = qdrant_connector._client.get_collection
+
+    async def counting_get_collection(collection_name):
+        calls.append(collection_name)
+        return await get_collection(collection_name)
+
+    monkeypatch.setattr(
+        qdrant_connector._client, "get_collection", counting_get_collection
+    )
+
+    assert await qdrant_connector.search("fox") == []
+    await qdrant_connector.store(Entry(content="The quick brown fox"))
+    await qdrant_connector.store(Entry(content="Lorem ipsum dolor sit amet"))
+    results = await qdrant_connector.search("fox")
+
+    # The missing collection was looked up twice, then the creation updated the cache
+    assert len(calls) == 2
+    assert len(results) == 2
+
+
+@pytest.mark.asyncio
+async def test_collection_created_by_another_client(
+    qdrant_connector, embedding_provider
+):
+    """Test that a collection missing at first is found once another client creates it."""
+    collection_name = qdrant_connector._default_collection_name
+    assert await qdrant_connector.search("fox") == []
+
+    await qdrant_connector._client.create_collection(
+        collection_name=collection_name,
+        vectors_config={
+            "fake-vector": models.VectorParams(
+                size=embedding_provider.size, distance=models.Distance.COSINE
+            )
+        },
+    )
+    await qdrant_connector.store(Entry(content="The quick brown fox"))
+
+    results = await qdrant_connector.search("fox")
+    assert [result.content for result in results] == ["The quick brown fox"]
+
+
+@pytest.mark.asyncio
+async def test_deleted_collection_is_recreated(qdrant_connector):
+    """Test that a collection deleted behind the cache is detected and recreated."""
+    collection_name = qdrant_connector._default_collection_name
+    await qdrant_connector.store(Entry(content="The quick brown fox"))
+
+    await qdrant_connector._client.delete_collection(collection_name)
+
+    assert await qdrant_connector.search("fox") == []
+    await qdrant_connector.store(Entry(content="Lorem ipsum dolor sit amet"))
+    results = await qdrant_connector.search("lorem ipsum")
+    assert [result.content for result in results] == ["Lorem ipsum dolor sit amet"]
+
+
+@pytest.mark.asyncio
+async def test_mixed_collection_layouts(qdrant_connector, embedding_provider):
+    """Test that one connector serves legacy unnamed-vector and named-vector collections."""
+    await qdrant_connector._client.create_collection(
+        collection_name="legacy",
+        vectors_config=models.VectorParams(
+            size=embedding_provider.get_vector_size(),
+            distance=models.Distance.COSINE,
+        ),
+    )
+
+    await qdrant_connector.store(
+        Entry(content="The quick brown fox", metadata={"tag": "animal"}),
+        collection_name="legacy",
+    )
+    await qdrant_connector.store(Entry(content="The lazy dog"))
+
+    legacy_points, _ = await qdrant_connector._client.scroll("legacy")
+    assert legacy_points[0].payload == {"text": "The quick brown fox", "tag": "animal"}
+
+    legacy_results = await qdrant_connector.search("fox", collection_name="legacy")
+    named_results = await qdrant_connector.search("dog")
+    assert legacy_results == [
+        Entry(content="The quick brown fox", metadata={"tag": "animal"})
+    ]
+    assert [result.content for result in named_results] == ["The lazy dog"]
+
+
+@pytest.mark.asyncio
+async def test_collection_without_matching_vector(qdrant_connector):
+    """Test that a collection made for another model is reported, not queried."""
+    await qdrant_connector._client.create_collection(
+        collection_name="other-model",
+        vectors_config={
+            "other-vector": models.VectorParams(size=8, distance=models.Distance.DOT)
+        },
+    )
+
+    with pytest.raises(ValueError, match="other-vector"):
+        await qdrant_connector.search("fox", collection_name="other-model")
+
+
+@pytest.mark.asyncio
+async def test_store_many(qdrant_connector, embedding_provider):
+    """Test that the entries are embedded and upserted in chunks."""
+    entries = [
+        Entry(content=f"document number {i}", metadata={"i": i}) for i in range(5)
+    ]
+
+    await qdrant_connector.store_many(entries, batch_size=2)
+
+    assert [len(call) for call in embedding_provider.document_calls] == [2, 2, 1]
+    collection_name = qdrant_connector._default_collection_name
+    count = await qdrant_connector._client.count(collection_name)
+    assert count.count == 5
+    results = await qdrant_connector.search("number 3", limit=5)
+    assert sorted(result.metadata["i"] for result in results) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_long_entries_are_chunked(embedding_provider):
+    """Test that a long entry is stored as overlapping chunks sharing a parent ID."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name="chunked",
+        embedding_provider=embedding_provider,
+        chunk_max_tokens=4,
+        chunk_overlap=1,
+    )
+    content = "alpha beta gamma delta epsilon zeta eta theta iota"
+
+    await connector.store(Entry(content=content, metadata={"source": "greek"}))
+    await connector.store(Entry(content="short entry"))
+
+    # The chunks of an entry are embedded in one call
+    assert [len(call) for call in embedding_provider.document_calls] == [3, 1]
+    results = await connector.search("alpha", limit=10)
+    chunks = sorted(
+        (
+            result
+            for result in results
+            if (result.metadata or {}).get("source") == "greek"
+        ),
+        key=lambda result: result.metadata["chunk_index"],
+    )
+    assert [chunk.content for chunk in chunks] == [
+        "alpha beta gamma delta",
+        "delta epsilon zeta eta",
+        "eta theta iota",
+    ]
+    assert len({chunk.metadata["parent_id"] for chunk in chunks}) == 1
+    assert all(chunk.metadata["chunk_count"] == 3 for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_deterministic_ids_skip_stored_entries(embedding_provider):
+    """Test that an entry stored again is neither embedded nor duplicated."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name="deterministic",
+        embedding_provider=embedding_provider,
+        deterministic_ids=True,
+    )
+    entry = Entry(content="remember this", metadata={"b": 2, "a": 1})
+
+    await connector.store(entry)
+    await connector.store(Entry(content="remember this", metadata={"a": 1, "b": 2}))
+    await connector.store_many(
+        [entry, entry, Entry(content="remember that")], batch_size=2
+    )
+
+    assert [len(call) for call in embedding_provider.document_calls] == [1, 1]
+    count = await connector._client.count("deterministic")
+    assert count.count == 2
+
+    # A changed entry gets a new point
+    await connector.store(Entry(content="remember this", metadata={"a": 1, "b": 3}))
+    count = await connector._client.count("deterministic")
+    assert count.count == 3
+
+
+@pytest.mark.asyncio
+async def test_deterministic_ids_recreate_a_deleted_collection(embedding_provider):
+    """Test that the lookup of the stored entries recreates a collection deleted behind the cache."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name="deterministic",
+        embedding_provider=embedding_provider,
+        deterministic_ids=True,
+    )
+    await connector.store(Entry(content="remember this"))
+
+    await connector._client.delete_collection("deterministic")
+
+    await connector.store(Entry(content="remember this"))
+    await connector.store_many([Entry(content="remember that")])
+    count = await connector._client.count("deterministic")
+    assert count.count == 2
+    results = await connector.search("remember this")
+    assert "remember this" in [result.content for result in results]
+
+
+@pytest.mark.asyncio
+async def test_search_cache_is_invalidated_on_store(embedding_provider):
+    """Test that repeated searches are served from the cache until the collection changes."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name="cached",
+        embedding_provider=embedding_provider,
+        search_cache_size=16,
+    )
+    await connector.store(Entry(content="first document"))
+
+    first = await connector.search("document")
+    # The normalized query hits the cache, without embedding it again
+    second = await connector.search("  document ")
+    assert [entry.content for entry in second] == ["first document"]
+    assert second == first
+    assert len(embedding_provider.query_calls) == 1
+
+    await connector.store(Entry(content="second document"))
+    third = await connector.search("document")
+    assert sorted(entry.content for entry in third) == [
+        "first document",
+        "second document",
+    ]
+
+    stats = connector.search_cache_stats()
+    assert stats is not None
+    assert (stats.hits, stats.misses) == (1, 2)
+    assert stats.size_bytes > 0
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_reuses_rephrased_queries(embedding_provider):
+    """Test that a query with a close enough vector is answered from the semantic cache."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name="semantic",
+        embedding_provider=embedding_provider,
+        semantic_cache_size=16,
+        semantic_cache_threshold=0.99,
+    )
+    await connector.store(Entry(content="the first document"))
+    first = await connector.search("where is the document")
+
+    # The fake embeddings ignore the order of the words
+    assert await connector.search("the document is where") == first
+    await connector.search("completely unrelated")
+    stats = connector.semantic_cache_stats()
+    assert stats is not None
+    assert (stats.hits, stats.misses) == (1, 2)
+
+    # A write to the collection invalidates its cached results
+    await connector.store(Entry(content="another document"))
+    results = await connector.search("the document is where")
+    assert len(results) == 2
+    assert connector.semantic_cache_stats().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_skips_the_semantic_cache(embedding_provider):
+    """Test that queries differing in an exact term do not share their fused results."""
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name="hybrid-semantic",
+        embedding_provider=embedding_provider,
+        sparse_embedding_provider=FakeSparseEmbeddingProvider(),
+        semantic_cache_size=16,
+        semantic_cache_threshold=0.8,
+    )
+    await connector.store_many(
+        [Entry(content="smith"), Entry(content="jones"), Entry(content="other")]
+    )
+
+    smith = await connector.search("the paper on dense retrieval by smith", limit=1)
+    jones = await connector.search("the paper on dense retrieval by jones", limit=1)
+
+    assert [result.content for result in smith] == ["smith"]
+    assert [result.content for result in jones] == ["jones"]
+    stats = connector.semantic_cache_stats()
+    assert stats is not None
+    assert (stats.hits, stats.misses, stats.entries) == (0, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_searches_share_one_query(
+    qdrant_connector, embedding_provider, monkeypatch
+):
+    """Test that identical in-flight searches are coalesced into a single query."""
+    await qdrant_connector.store(Entry(content="shared document"))
+    query_points = qdrant_connector._client.query_points
+    calls = 0
+
+    async def counting_query_points(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return await query_points(*args, **kwargs)
+
+    monkeypatch.setattr(qdrant_connector._client, "query_points", counting_query_points)
+
+    results = await asyncio.gather(
+        *(qdrant_connector.search("document") for _ in range(5)),
+        qdrant_connector.search("document", limit=1),
+    )
+
+    assert calls == 2
+    assert len(embedding_provider.query_calls) == 2
+    assert all(result == results[0] for result in results)
+    # Every caller gets its own copy of the results
+    assert results[0][0] is not results[1][0]
+    assert qdrant_connector._in_flight_searches == {}
+    assert qdrant_connector._search_waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_single_search_is_not_copied(qdrant_connector, monkeypatch):
+    """Test that a caller waiting alone for a search gets the results without a copy."""
+    await qdrant_connector.store(Entry(content="shared document"))
+    model_copy = Entry.model_copy
+    copies = 0
+
+    def counting_model_copy(self, *args, **kwargs):
+        nonlocal copies
+        copies += 1
+        return model_copy(self, *args, **kwargs)
+
+    monkeypatch.setattr(Entry, "model_copy", counting_model_copy)
+
+    results = await qdrant_connector.search("document")
+    assert len(results) == 1
+    assert copies == 0
+
+    # Of three callers sharing a search, the two resuming first copy the results
+    await asyncio.gather(*(qdrant_connector.search("shared") for _ in range(3)))
+    assert copies == 2
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search(embedding_provider):
+    """Test that the sparse vectors are stored next to the dense ones and fused by Qdrant."""
+    sparse_embedding_provider = FakeSparseEmbeddingProvider()
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name="hybrid",
+        embedding_provider=embedding_provider,
+        sparse_embedding_provider=sparse_embedding_provider,
+        hybrid_fusion="dbsf",
+    )
+    await connector.store_many(
+        [
+            Entry(content="vector search with Qdrant"),
+            Entry(content="the paper by Karpukhin on dense retrieval"),
+        ]
+    )
+
+    info = await connector._client.get_collection("hybrid")
+    assert (
+        info.config.params.sparse_vectors["fake-sparse"].modifier == models.Modifier.IDF
+    )
+    points, _ = await connector._client.scroll("hybrid", with_vectors=True)
+    assert all(set(point.vector) == {"fake-vector", "fake-sparse"} for point in points)
+
+    results = await connector.search("Karpukhin", limit=1)
+    assert [result.content for result in results] == [
+        "the paper by Karpukhin on dense retrieval"
+    ]
+    assert sparse_embedding_provider.query_calls == ["Karpukhin"]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_with_an_unnamed_dense_vector():
+    """Test that the sparse vectors are stored next to an unnamed dense vector, as for OpenAI models."""
+    embedding_provider = FakeEmbeddingProvider(vector_name="")
+    sparse_embedding_provider = FakeSparseEmbeddingProvider()
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name="hybrid-unnamed",
+        embedding_provider=embedding_provider,
+        sparse_embedding_provider=sparse_embedding_provider,
+    )
+    await connector.store_many(
+        [
+            Entry(content="vector search with Qdrant", metadata={"tag": "search"}),
+            Entry(content="the paper by Karpukhin on dense retrieval"),
+        ]
+    )
+
+    points, _ = await connector._client.scroll("hybrid-unnamed", with_vectors=True)
+    assert all(set(point.vector) == {"", "fake-sparse"} for point in points)
+
+    results = await connector.search("Karpukhin", limit=1)
+    assert [result.content for result in results] == [
+        "the paper by Karpukhin on dense retrieval"
+    ]
+    results = await connector.search("vector search with Qdrant", limit=1)
+    assert results == [
+        Entry(content="vector search with Qdrant", metadata={"tag": "search"})
+    ]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_falls_back_to_dense_collections(
+    qdrant_connector, embedding_provider
+):
+    """Test that a collection created without a sparse vector is still searched with the dense one."""
+    await qdrant_connector.store(Entry(content="dense only document"))
+    sparse_embedding_provider = FakeSparseEmbeddingProvider()
+    connector = QdrantConnector(
+        qdrant_url=None,
+        qdrant_api_key=None,
+        collection_name=qdrant_connector._default_collection_name,
+        embedding_provider=embedding_provider,
+        sparse_embedding_provider=sparse_embedding_provider,
+    )
+    connector._client = qdrant_connector._client
+
+    await connector.store(Entry(content="another dense document"))
+    results = await connector.search("document")
+
+    assert len(results) == 2
+    assert sparse_embedding_provider.document_calls == []
+    assert sparse_embedding_provider.query_calls == []
+
+
+@pytest.mark.asyncio
+async def test_sparse_only_mode():
+    """Test that a connector without a dense model stores and searches sparse vectors only."""
+    sparse_embedding_provider = FakeSparseEmbeddingProvider()
+    connector = QdrantConnector(
+        qdrant_url=":memory:",
+        qdrant_api_key=None,
+        collection_name="sparse",
+        embedding_provider=None,
+        sparse_embedding_provider=sparse_embedding_provider,
+        chunk_max_tokens=4,
+    )
+    await connector.store(Entry(content="BM25 ranks documents by their terms"))
+    await connector.store_many([Entry(content="dense retrieval with embeddings")])
+
+    info = await connector._client.get_collection("sparse")
+    assert info.config.params.vectors == {}
+    assert list(info.config.params.sparse_vectors) == ["fake-sparse"]
+
+    results = await connector.search("embeddings", limit=1)
+    assert [result.content for result in results] == ["dense retrieval with embeddings"]
+    # The entries are chunked with the approximate tokens of the sparse provider
+    results = await connector.search("terms", limit=1)
+    assert [result.content for result in results] == ["their terms"]
+
+
+@pytest.mark.asyncio
+async def test_sparse_only_mode_requires_a_sparse_vector(qdrant_connector):
+    """Test that a sparse-only connector rejects a collection with dense vectors only."""
+    await qdrant_connector.store(Entry(content="dense document"))
+    connector = QdrantConnector(
+        qdrant_url=None,
+        qdrant_api_key=None,
+        collection_name=qdrant_connector._default_collection_name,
+        embedding_provider=None,
+        sparse_embedding_provider=FakeSparseEmbeddingProvider(),
+    )
+    connector._client = qdrant_connector._client
+
+    with pytest.raises(ValueError, match="no sparse vector"):
+        await connector.search("document")
+
+
+def test_an_embedding_provider_is_required():
+    with pytest.raises(ValueError):
+        QdrantConnector(
+            qdrant_url=":memory:",
+            qdrant_api_key=None,
+            collection_name="none",
+            embedding_provider=None,
+        )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_stores_create_the_collection_once(
+    qdrant_connector, embedding_provider, monkeypatch
+):
+    """Test that concurrent stores into a new collection do not fail on creating it twice."""
+    client = qdrant_connector._client
+    get_collection = client.get_collection
+
+    async def slow_get_collection(collection_name):
+        # Leaves the other stores time to find the collection missing as well
+        try:
+            return await get_collection(collection_name)
+        finally:
+            await asyncio.sleep(0.01)
+
+    monkeypatch.setattr(client, "get_collection", slow_get_collection)
+    # Another connector, e.g. of another process, creates the same collection concurrently
+    other_connector = QdrantConnector(
+        qdrant_url=None,
+        qdrant_api_key=None,
+        collection_name=qdrant_connector._default_collection_name,
+        embedding_provider=embedding_provider,
+    )
+    other_connector._client = client
+
+    await asyncio.gather(
+        qdrant_connector.store(Entry(content="first")),
+        qdrant_connector.store(Entry(content="second")),
+        other_connector.store(Entry(content="third")),
+    )
+
+    count = await client.count(qdrant_connector._default_collection_name)
+    assert count.count == 3
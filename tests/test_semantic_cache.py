@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from mcp_server_qdrant.common.semantic_cache import SemanticCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSemanticCache:
+    def test_similar_vector_hits(self):
+        cache: SemanticCache[str, str] = SemanticCache(max_entries=4, threshold=0.9)
+        cache.put("ctx", np.array([1.0, 0.0, 0.0]), "x-axis")
+        cache.put("ctx", np.array([0.0, 1.0, 0.0]), "y-axis")
+
+        assert cache.get("ctx", np.array([2.0, 0.1, 0.0])) == "x-axis"
+        assert cache.get("ctx", np.array([1.0, 1.0, 0.0])) is None
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 2)
+
+    def test_context_must_match(self):
+        cache: SemanticCache[str, str] = SemanticCache(max_entries=4, threshold=0.9)
+        cache.put("a", np.array([1.0, 0.0]), "value of a")
+
+        assert cache.get("b", np.array([1.0, 0.0])) is None
+        assert cache.get("a", np.array([1.0, 0.0])) == "value of a"
+
+    def test_evicts_least_recently_used(self):
+        cache: SemanticCache[str, str] = SemanticCache(max_entries=2, threshold=0.9)
+        cache.put("ctx", np.array([1.0, 0.0, 0.0]), "x")
+        cache.put("ctx", np.array([0.0, 1.0, 0.0]), "y")
+        assert cache.get("ctx", np.array([1.0, 0.0, 0.0])) == "x"
+        cache.put("ctx", np.array([0.0, 0.0, 1.0]), "z")
+
+        assert cache.get("ctx", np.array([0.0, 1.0, 0.0])) is None
+        assert cache.get("ctx", np.array([1.0, 0.0, 0.0])) == "x"
+        assert cache.stats().evictions == 1
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache: SemanticCache[str, str] = SemanticCache(
+            max_entries=2, threshold=0.9, ttl=10, clock=clock
+        )
+        cache.put("ctx", np.array([1.0, 0.0]), "x")
+        clock.now = 10
+
+        assert cache.get("ctx", np.array([1.0, 0.0])) is None
+        assert cache.stats().expirations == 1
+        assert len(cache) == 0
+
+    def test_invalidate(self):
+        cache: SemanticCache[tuple, str] = SemanticCache(max_entries=4, threshold=0.9)
+        cache.put(("a", 1), np.array([1.0, 0.0]), "a")
+        cache.put(("b", 1), np.array([1.0, 0.0]), "b")
+
+        cache.invalidate(lambda context: context[0] == "a")
+
+        assert cache.get(("a", 1), np.array([1.0, 0.0])) is None
+        assert cache.get(("b", 1), np.array([1.0, 0.0])) == "b"
+
+    def test_invalid_threshold(self):
+        with pytest.raises(ValueError):
+            SemanticCache(max_entries=4, threshold=1.5)
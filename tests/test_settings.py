@@ -1,5 +1,11 @@
 import pytest
+from qdrant_client import models
 
+from mcp_server_qdrant.embeddings.factory import (
+    create_embedding_provider,
+    create_sparse_embedding_provider,
+)
+from mcp_server_qdrant.embeddings.sparse import FastEmbedSparseProvider
 from mcp_server_qdrant.embeddings.types import EmbeddingProviderType
 from mcp_server_qdrant.settings import (
     DEFAULT_TOOL_FIND_DESCRIPTION,
@@ -78,6 +84,35 @@ class TestEmbeddingProviderSettings:
         assert settings.provider_type == EmbeddingProviderType.FASTEMBED
         assert settings.model_name == "custom_model"
 
+    def test_executor_config(self, monkeypatch):
+        """Test configuring the dedicated inference executor."""
+        monkeypatch.setenv("EMBEDDING_EXECUTOR", "process")
+        monkeypatch.setenv("EMBEDDING_EXECUTOR_WORKERS", "4")
+        monkeypatch.setenv("EMBEDDING_THREADS", "2")
+        settings = EmbeddingProviderSettings()
+        assert settings.executor == "process"
+        assert settings.executor_workers == 4
+        assert settings.threads == 2
+
+    def test_sparse_only_provider(self, monkeypatch):
+        """Test that the sparse-only provider type creates no dense model."""
+        monkeypatch.setenv("EMBEDDING_PROVIDER", "fastembed-sparse")
+        monkeypatch.setenv("EMBEDDING_MODEL", "Qdrant/bm25")
+        settings = EmbeddingProviderSettings()
+        assert settings.provider_type == EmbeddingProviderType.FASTEMBED_SPARSE
+
+        assert create_embedding_provider(settings) is None
+        sparse_provider = create_sparse_embedding_provider(settings)
+        assert isinstance(sparse_provider, FastEmbedSparseProvider)
+        assert sparse_provider.get_vector_name() == "fast-sparse-bm25"
+        assert sparse_provider.get_modifier() == models.Modifier.IDF
+
+    def test_invalid_executor(self, monkeypatch):
+        """Test that unknown executor types are rejected."""
+        monkeypatch.setenv("EMBEDDING_EXECUTOR", "gpu")
+        with pytest.raises(ValueError):
+            EmbeddingProviderSettings()
+
 
 class TestToolSettings:
     def test_default_values(self):